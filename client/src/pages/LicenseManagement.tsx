@@ -31,14 +31,29 @@ export default function LicenseManagement() {
     count: "1",
   });
 
-  // Fetch seller products
-  const { data: sellerProducts = [] } = trpc.products.getMySelling.useQuery(
-    undefined,
-    { enabled: isAuthenticated }
+  // Fetch seller products page by page
+  const sellerProductsQuery = trpc.products.getMySelling.useInfiniteQuery(
+    { limit: 100 },
+    {
+      enabled: isAuthenticated,
+      getNextPageParam: (lastPage) => lastPage.nextCursor,
+    }
+  );
+  const sellerProducts =
+    sellerProductsQuery.data?.pages.flatMap((page) => page.items) ?? [];
+
+  // Fetch seller licenses page by page
+  const licensesQuery = trpc.licenses.getSellerLicenses.useInfiniteQuery(
+    {},
+    {
+      enabled: isAuthenticated,
+      getNextPageParam: (lastPage) => lastPage.nextCursor,
+    }
   );
+  const allLicenses =
+    licensesQuery.data?.pages.flatMap((page) => page.items) ?? [];
 
-  // Fetch all licenses (we'll need to create this endpoint)
-  const { data: allLicenses = [] } = trpc.licenses.getSellerLicenses.useQuery(
+  const { data: licenseCounts } = trpc.licenses.getSellerLicenseCounts.useQuery(
     undefined,
     { enabled: isAuthenticated }
   );
@@ -154,6 +169,18 @@ export default function LicenseManagement() {
                       ))}
                     </SelectContent>
                   </Select>
+                  {sellerProductsQuery.hasNextPage && (
+                    <Button
+                      type="button"
+                      variant="link"
+                      size="sm"
+                      onClick={() => sellerProductsQuery.fetchNextPage()}
+                      disabled={sellerProductsQuery.isFetchingNextPage}
+                      className="mt-1 h-auto px-0 text-gray-600"
+                    >
+                      제품 더 불러오기
+                    </Button>
+                  )}
                 </div>
                 <div>
                   <label className="text-sm font-medium">생성 개수</label>
@@ -187,28 +214,28 @@ export default function LicenseManagement() {
           <Card className="p-6 bg-white border border-gray-200">
             <p className="text-gray-600 text-sm font-medium">총 라이선스</p>
             <p className="text-3xl font-bold text-black mt-2">
-              {allLicenses.length}
+              {licenseCounts?.total ?? 0}
             </p>
           </Card>
 
           <Card className="p-6 bg-white border border-gray-200">
             <p className="text-gray-600 text-sm font-medium">활성</p>
             <p className="text-3xl font-bold text-green-600 mt-2">
-              {allLicenses.filter((l: any) => l.status === "active").length}
+              {licenseCounts?.active ?? 0}
             </p>
           </Card>
 
           <Card className="p-6 bg-white border border-gray-200">
             <p className="text-gray-600 text-sm font-medium">비활성</p>
             <p className="text-3xl font-bold text-gray-600 mt-2">
-              {allLicenses.filter((l: any) => l.status === "inactive").length}
+              {licenseCounts?.inactive ?? 0}
             </p>
           </Card>
 
           <Card className="p-6 bg-white border border-gray-200">
             <p className="text-gray-600 text-sm font-medium">만료됨</p>
             <p className="text-3xl font-bold text-red-600 mt-2">
-              {allLicenses.filter((l: any) => l.status === "expired").length}
+              {licenseCounts?.expired ?? 0}
             </p>
           </Card>
         </div>
@@ -341,6 +368,18 @@ export default function LicenseManagement() {
             </table>
           </div>
         )}
+        {licensesQuery.hasNextPage && (
+          <div className="mt-6 text-center">
+            <Button
+              variant="outline"
+              onClick={() => licensesQuery.fetchNextPage()}
+              disabled={licensesQuery.isFetchingNextPage}
+              className="border-gray-300"
+            >
+              더 보기
+            </Button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -11,15 +11,25 @@ export default function MyPage() {
   const [activeTab, setActiveTab] = useState("orders");
 
   // Fetch buyer orders
-  const { data: orders = [] } = trpc.orders.getMyOrders.useQuery(undefined, {
-    enabled: isAuthenticated,
-  });
+  const ordersQuery = trpc.orders.getMyOrders.useInfiniteQuery(
+    {},
+    {
+      enabled: isAuthenticated,
+      getNextPageParam: (lastPage) => lastPage.nextCursor,
+    }
+  );
+  const orders = ordersQuery.data?.pages.flatMap((page) => page.items) ?? [];
 
   // Fetch buyer licenses
-  const { data: licenses = [] } = trpc.licenses.getMyLicenses.useQuery(
-    undefined,
-    { enabled: isAuthenticated }
+  const licensesQuery = trpc.licenses.getMyLicenses.useInfiniteQuery(
+    {},
+    {
+      enabled: isAuthenticated,
+      getNextPageParam: (lastPage) => lastPage.nextCursor,
+    }
   );
+  const licenses =
+    licensesQuery.data?.pages.flatMap((page) => page.items) ?? [];
 
   const handleCopyLicense = (key: string) => {
     navigator.clipboard.writeText(key);
@@ -172,6 +182,18 @@ export default function MyPage() {
                 ))}
               </div>
             )}
+            {ordersQuery.hasNextPage && (
+              <div className="mt-6 text-center">
+                <Button
+                  variant="outline"
+                  onClick={() => ordersQuery.fetchNextPage()}
+                  disabled={ordersQuery.isFetchingNextPage}
+                  className="border-gray-300"
+                >
+                  더 보기
+                </Button>
+              </div>
+            )}
           </div>
         )}
 
@@ -277,6 +299,18 @@ export default function MyPage() {
                 </table>
               </div>
             )}
+            {licensesQuery.hasNextPage && (
+              <div className="mt-6 text-center">
+                <Button
+                  variant="outline"
+                  onClick={() => licensesQuery.fetchNextPage()}
+                  disabled={licensesQuery.isFetchingNextPage}
+                  className="border-gray-300"
+                >
+                  더 보기
+                </Button>
+              </div>
+            )}
           </div>
         )}
       </div>
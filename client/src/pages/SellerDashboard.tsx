@@ -18,7 +18,7 @@ import {
   SelectValue,
 } from "@/components/ui/select";
 import { trpc } from "@/lib/trpc";
-import { useState } from "react";
+import { useMemo, useState } from "react";
 import { Plus, Edit2, Trash2, Eye, Download, TrendingUp } from "lucide-react";
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, LineChart, Line } from "recharts";
 import { toast } from "sonner";
@@ -43,15 +43,32 @@ export default function SellerDashboard() {
   });
 
   // Fetch seller data
-  const { data: sellerProducts = [] } = trpc.products.getMySelling.useQuery(
-    undefined,
-    { enabled: isAuthenticated }
+  const sellerProductsQuery = trpc.products.getMySelling.useInfiniteQuery(
+    {},
+    {
+      enabled: isAuthenticated,
+      getNextPageParam: (lastPage) => lastPage.nextCursor,
+    }
   );
+  const sellerProducts =
+    sellerProductsQuery.data?.pages.flatMap((page) => page.items) ?? [];
 
-  const { data: sellerOrders = [] } = trpc.orders.getSellingOrders.useQuery(
-    undefined,
+  const { data: recentOrdersPage } = trpc.orders.getSellingOrders.useQuery(
+    { limit: 10 },
     { enabled: isAuthenticated }
   );
+  const sellerOrders = recentOrdersPage?.items ?? [];
+
+  // Sales rollups for the last six months (one row per day, not per order)
+  const [statsRange] = useState(() => {
+    const to = new Date();
+    const from = new Date(to);
+    from.setMonth(from.getMonth() - 5, 1);
+    return { from, to };
+  });
+  const { data: sellerStats } = trpc.seller.stats.useQuery(statsRange, {
+    enabled: isAuthenticated,
+  });
 
   const { data: sellerProfile } = trpc.sellerProfile.getProfile.useQuery(
     undefined,
@@ -143,26 +160,33 @@ export default function SellerDashboard() {
     });
   };
 
-  // Calculate statistics
-  const totalRevenue = sellerOrders
-    .filter((order: any) => order.status === "completed")
-    .reduce((sum: number, order: any) => sum + parseFloat(order.totalPrice), 0);
-
-  const totalSales = sellerOrders.filter(
-    (order: any) => order.status === "completed"
-  ).length;
+  // Statistics are aggregated on the server (net of refunds)
+  const totalRevenue = sellerStats
+    ? sellerStats.totals.revenue - sellerStats.totals.refundAmount
+    : 0;
+  const totalSales = sellerStats
+    ? sellerStats.totals.sales - sellerStats.totals.refunds
+    : 0;
+  const activeProducts = sellerStats?.activeProducts ?? 0;
 
-  const activeProducts = sellerProducts.length;
-
-  // Mock chart data - in real app, this would come from analytics
-  const chartData = [
-    { month: "1월", sales: 400, revenue: 2400 },
-    { month: "2월", sales: 300, revenue: 1398 },
-    { month: "3월", sales: 200, revenue: 9800 },
-    { month: "4월", sales: 278, revenue: 3908 },
-    { month: "5월", sales: 189, revenue: 4800 },
-    { month: "6월", sales: 239, revenue: 3800 },
-  ];
+  // Monthly chart data built from the daily series
+  const chartData = useMemo(() => {
+    const months = new Map<string, { month: string; sales: number; revenue: number }>();
+    const cursor = new Date(statsRange.from);
+    while (cursor <= statsRange.to) {
+      const key = `${cursor.getFullYear()}-${cursor.getMonth()}`;
+      months.set(key, { month: `${cursor.getMonth() + 1}월`, sales: 0, revenue: 0 });
+      cursor.setMonth(cursor.getMonth() + 1);
+    }
+    for (const point of sellerStats?.series ?? []) {
+      const [year, month] = point.day.split("-").map(Number);
+      const bucket = months.get(`${year}-${month - 1}`);
+      if (!bucket) continue;
+      bucket.sales += point.sales - point.refunds;
+      bucket.revenue += point.revenue - point.refundAmount;
+    }
+    return Array.from(months.values());
+  }, [sellerStats, statsRange]);
 
   if (!isAuthenticated) {
     return (
@@ -536,6 +560,18 @@ export default function SellerDashboard() {
               ))}
             </div>
           )}
+          {sellerProductsQuery.hasNextPage && (
+            <div className="mt-6 text-center">
+              <Button
+                variant="outline"
+                onClick={() => sellerProductsQuery.fetchNextPage()}
+                disabled={sellerProductsQuery.isFetchingNextPage}
+                className="border-gray-300"
+              >
+                더 보기
+              </Button>
+            </div>
+          )}
         </div>
 
         {/* Recent Orders */}
@@ -568,7 +604,7 @@ export default function SellerDashboard() {
                   </tr>
                 </thead>
                 <tbody>
-                  {sellerOrders.slice(0, 10).map((order: any) => (
+                  {sellerOrders.map((order: any) => (
                     <tr
                       key={order.id}
                       className="border-b border-gray-100 hover:bg-gray-50"
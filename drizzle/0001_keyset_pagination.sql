@@ -0,0 +1,19 @@
+DROP INDEX "products_seller_idx";--> statement-breakpoint
+DROP INDEX "products_category_idx";--> statement-breakpoint
+DROP INDEX "license_keys_product_idx";--> statement-breakpoint
+DROP INDEX "license_keys_buyer_idx";--> statement-breakpoint
+DROP INDEX "orders_buyer_idx";--> statement-breakpoint
+DROP INDEX "orders_seller_idx";--> statement-breakpoint
+DROP INDEX "reviews_product_idx";--> statement-breakpoint
+ALTER TABLE "license_keys" ALTER COLUMN "createdAt" SET DATA TYPE timestamp (3);--> statement-breakpoint
+ALTER TABLE "orders" ALTER COLUMN "createdAt" SET DATA TYPE timestamp (3);--> statement-breakpoint
+ALTER TABLE "products" ALTER COLUMN "createdAt" SET DATA TYPE timestamp (3);--> statement-breakpoint
+ALTER TABLE "reviews" ALTER COLUMN "createdAt" SET DATA TYPE timestamp (3);--> statement-breakpoint
+CREATE INDEX "license_keys_product_created_idx" ON "license_keys" USING btree ("productId","createdAt","id");--> statement-breakpoint
+CREATE INDEX "license_keys_buyer_created_idx" ON "license_keys" USING btree ("buyerId","createdAt","id");--> statement-breakpoint
+CREATE INDEX "orders_buyer_created_idx" ON "orders" USING btree ("buyerId","createdAt","id");--> statement-breakpoint
+CREATE INDEX "orders_seller_created_idx" ON "orders" USING btree ("sellerId","createdAt","id");--> statement-breakpoint
+CREATE INDEX "products_seller_created_idx" ON "products" USING btree ("sellerId","createdAt","id");--> statement-breakpoint
+CREATE INDEX "products_active_created_idx" ON "products" USING btree ("createdAt","id") WHERE "products"."active" = true;--> statement-breakpoint
+CREATE INDEX "products_category_created_idx" ON "products" USING btree ("category","createdAt","id") WHERE "products"."active" = true;--> statement-breakpoint
+CREATE INDEX "reviews_product_created_idx" ON "reviews" USING btree ("productId","createdAt","id");
\ No newline at end of file
@@ -0,0 +1,14 @@
+CREATE TABLE "seller_daily_sales" (
+	"id" serial PRIMARY KEY NOT NULL,
+	"sellerId" integer NOT NULL,
+	"productId" integer NOT NULL,
+	"day" date NOT NULL,
+	"salesCount" integer DEFAULT 0 NOT NULL,
+	"revenue" numeric(15, 2) DEFAULT '0' NOT NULL,
+	"refundCount" integer DEFAULT 0 NOT NULL,
+	"refundAmount" numeric(15, 2) DEFAULT '0' NOT NULL,
+	"updatedAt" timestamp DEFAULT now() NOT NULL
+);
+--> statement-breakpoint
+CREATE UNIQUE INDEX "seller_daily_sales_seller_product_day_idx" ON "seller_daily_sales" USING btree ("sellerId","productId","day");--> statement-breakpoint
+CREATE INDEX "seller_daily_sales_seller_day_idx" ON "seller_daily_sales" USING btree ("sellerId","day");
\ No newline at end of file
@@ -0,0 +1,25 @@
+CREATE TABLE "product_ratings" (
+	"productId" integer PRIMARY KEY NOT NULL,
+	"ratingCount" integer DEFAULT 0 NOT NULL,
+	"ratingSum" integer DEFAULT 0 NOT NULL,
+	"stars1" integer DEFAULT 0 NOT NULL,
+	"stars2" integer DEFAULT 0 NOT NULL,
+	"stars3" integer DEFAULT 0 NOT NULL,
+	"stars4" integer DEFAULT 0 NOT NULL,
+	"stars5" integer DEFAULT 0 NOT NULL,
+	"updatedAt" timestamp DEFAULT now() NOT NULL
+);
+--> statement-breakpoint
+CREATE INDEX "reviews_product_helpful_idx" ON "reviews" USING btree ("productId","helpful","id");--> statement-breakpoint
+INSERT INTO "product_ratings" ("productId", "ratingCount", "ratingSum", "stars1", "stars2", "stars3", "stars4", "stars5")
+SELECT
+	"productId",
+	COUNT(*),
+	SUM("rating"),
+	COUNT(*) FILTER (WHERE "rating" = 1),
+	COUNT(*) FILTER (WHERE "rating" = 2),
+	COUNT(*) FILTER (WHERE "rating" = 3),
+	COUNT(*) FILTER (WHERE "rating" = 4),
+	COUNT(*) FILTER (WHERE "rating" = 5)
+FROM "reviews"
+GROUP BY "productId";
\ No newline at end of file
@@ -0,0 +1 @@
+CREATE UNIQUE INDEX "orders_transaction_id_idx" ON "orders" USING btree ("transactionId");
\ No newline at end of file
@@ -0,0 +1,13 @@
+CREATE TABLE "download_counts" (
+	"id" serial PRIMARY KEY NOT NULL,
+	"userId" integer NOT NULL,
+	"productId" integer NOT NULL,
+	"count" integer DEFAULT 0 NOT NULL,
+	"updatedAt" timestamp DEFAULT now() NOT NULL
+);
+--> statement-breakpoint
+CREATE UNIQUE INDEX "download_counts_user_product_idx" ON "download_counts" USING btree ("userId","productId");--> statement-breakpoint
+INSERT INTO "download_counts" ("userId", "productId", "count")
+SELECT "userId", "productId", COUNT(*)
+FROM "downloads"
+GROUP BY "userId", "productId";
\ No newline at end of file
@@ -9,7 +9,11 @@ import {
   boolean,
   integer,
   index,
+  uniqueIndex,
+  date,
+  customType,
 } from "drizzle-orm/pg-core";
+import { sql } from "drizzle-orm";
 
 // Enum definitions for PostgreSQL
 export const userRoleEnum = pgEnum("user_role", ["user", "admin"]);
@@ -17,6 +21,13 @@ export const licenseTypeEnum = pgEnum("license_type", ["perpetual", "subscriptio
 export const licenseStatusEnum = pgEnum("license_status", ["active", "inactive", "revoked", "expired"]);
 export const orderStatusEnum = pgEnum("order_status", ["pending", "completed", "failed", "refunded"]);
 
+/** PostgreSQL full-text search document (read only, used in WHERE/ORDER BY). */
+const tsvector = customType<{ data: string }>({
+  dataType() {
+    return "tsvector";
+  },
+});
+
 /**
  * Core user table backing auth flow.
  * Extend this file with additional tables as your product grows.
@@ -62,16 +73,40 @@ export const products = pgTable(
     maxDownloads: integer("maxDownloads"),
     expiryDays: integer("expiryDays"),
     active: boolean("active").default(true).notNull(),
-    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    createdAt: timestamp("createdAt", { precision: 3 }).defaultNow().notNull(),
     updatedAt: timestamp("updatedAt").defaultNow().notNull(),
+    /**
+     * Search document over title (weight A) and description (weight B).
+     * Uses the 'simple' configuration (no stemming) so Korean and English
+     * tokens are indexed as-is; see server/search.ts.
+     */
+    searchVector: tsvector("searchVector").generatedAlwaysAs(
+      sql`setweight(to_tsvector('simple', coalesce("title", '')), 'A') || setweight(to_tsvector('simple', coalesce("description", '')), 'B')`
+    ),
   },
   (table) => ({
-    sellerIdx: index("products_seller_idx").on(table.sellerId),
-    categoryIdx: index("products_category_idx").on(table.category),
+    // Full-text and trigram (typo-tolerant title) search, see server/search.ts
+    searchIdx: index("products_search_idx").using("gin", table.searchVector),
+    titleTrgmIdx: index("products_title_trgm_idx").using(
+      "gin",
+      table.title.op("gin_trgm_ops")
+    ),
+    // Keyset pagination indexes on (createdAt, id), see server/pagination.ts
+    sellerCreatedIdx: index("products_seller_created_idx").on(
+      table.sellerId,
+      table.createdAt,
+      table.id
+    ),
+    activeCreatedIdx: index("products_active_created_idx")
+      .on(table.createdAt, table.id)
+      .where(sql`${table.active} = true`),
+    categoryCreatedIdx: index("products_category_created_idx")
+      .on(table.category, table.createdAt, table.id)
+      .where(sql`${table.active} = true`),
   })
 );
 
-export type Product = typeof products.$inferSelect;
+export type Product = Omit<typeof products.$inferSelect, "searchVector">;
 export type InsertProduct = typeof products.$inferInsert;
 
 /**
@@ -91,12 +126,20 @@ export const licenseKeys = pgTable(
     expiresAt: timestamp("expiresAt"),
     activationCount: integer("activationCount").default(0).notNull(),
     maxActivations: integer("maxActivations").default(1).notNull(),
-    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    createdAt: timestamp("createdAt", { precision: 3 }).defaultNow().notNull(),
     updatedAt: timestamp("updatedAt").defaultNow().notNull(),
   },
   (table) => ({
-    productIdx: index("license_keys_product_idx").on(table.productId),
-    buyerIdx: index("license_keys_buyer_idx").on(table.buyerId),
+    productCreatedIdx: index("license_keys_product_created_idx").on(
+      table.productId,
+      table.createdAt,
+      table.id
+    ),
+    buyerCreatedIdx: index("license_keys_buyer_created_idx").on(
+      table.buyerId,
+      table.createdAt,
+      table.id
+    ),
     keyIdx: index("license_keys_key_idx").on(table.key),
   })
 );
@@ -123,14 +166,24 @@ export const orders = pgTable(
     paymentMethod: varchar("paymentMethod", { length: 50 }),
     transactionId: varchar("transactionId", { length: 255 }),
     notes: text("notes"),
-    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    createdAt: timestamp("createdAt", { precision: 3 }).defaultNow().notNull(),
     updatedAt: timestamp("updatedAt").defaultNow().notNull(),
   },
   (table) => ({
-    buyerIdx: index("orders_buyer_idx").on(table.buyerId),
-    sellerIdx: index("orders_seller_idx").on(table.sellerId),
+    buyerCreatedIdx: index("orders_buyer_created_idx").on(
+      table.buyerId,
+      table.createdAt,
+      table.id
+    ),
+    sellerCreatedIdx: index("orders_seller_created_idx").on(
+      table.sellerId,
+      table.createdAt,
+      table.id
+    ),
     productIdx: index("orders_product_idx").on(table.productId),
     statusIdx: index("orders_status_idx").on(table.status),
+    // One order per Toss paymentKey; makes payment confirmation idempotent.
+    transactionIdx: uniqueIndex("orders_transaction_id_idx").on(table.transactionId),
   })
 );
 
@@ -152,11 +205,20 @@ export const reviews = pgTable(
     content: text("content").notNull(),
     helpful: integer("helpful").default(0).notNull(), // Number of helpful votes
     isVerifiedPurchase: boolean("isVerifiedPurchase").default(true).notNull(),
-    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    createdAt: timestamp("createdAt", { precision: 3 }).defaultNow().notNull(),
     updatedAt: timestamp("updatedAt").defaultNow().notNull(),
   },
   (table) => ({
-    productIdx: index("reviews_product_idx").on(table.productId),
+    productCreatedIdx: index("reviews_product_created_idx").on(
+      table.productId,
+      table.createdAt,
+      table.id
+    ),
+    productHelpfulIdx: index("reviews_product_helpful_idx").on(
+      table.productId,
+      table.helpful,
+      table.id
+    ),
     buyerIdx: index("reviews_buyer_idx").on(table.buyerId),
   })
 );
@@ -164,6 +226,26 @@ export const reviews = pgTable(
 export type Review = typeof reviews.$inferSelect;
 export type InsertReview = typeof reviews.$inferInsert;
 
+/**
+ * Product rating aggregates
+ * Denormalized review count, rating sum and 1-5 star histogram per product,
+ * updated in the same transaction as review writes.
+ */
+export const productRatings = pgTable("product_ratings", {
+  productId: integer("productId").primaryKey(),
+  ratingCount: integer("ratingCount").default(0).notNull(),
+  ratingSum: integer("ratingSum").default(0).notNull(),
+  stars1: integer("stars1").default(0).notNull(),
+  stars2: integer("stars2").default(0).notNull(),
+  stars3: integer("stars3").default(0).notNull(),
+  stars4: integer("stars4").default(0).notNull(),
+  stars5: integer("stars5").default(0).notNull(),
+  updatedAt: timestamp("updatedAt").defaultNow().notNull(),
+});
+
+export type ProductRating = typeof productRatings.$inferSelect;
+export type InsertProductRating = typeof productRatings.$inferInsert;
+
 /**
  * Downloads table
  * Tracks product downloads by users
@@ -189,6 +271,30 @@ export const downloads = pgTable(
 export type Download = typeof downloads.$inferSelect;
 export type InsertDownload = typeof downloads.$inferInsert;
 
+/**
+ * Per-user download counters
+ * Enforces products.maxDownloads with a single conditional upsert instead of
+ * counting downloads rows, see server/downloads.ts
+ */
+export const downloadCounts = pgTable(
+  "download_counts",
+  {
+    id: serial("id").primaryKey(),
+    userId: integer("userId").notNull(),
+    productId: integer("productId").notNull(),
+    count: integer("count").default(0).notNull(),
+    updatedAt: timestamp("updatedAt").defaultNow().notNull(),
+  },
+  (table) => ({
+    userProductIdx: uniqueIndex("download_counts_user_product_idx").on(
+      table.userId,
+      table.productId
+    ),
+  })
+);
+
+export type DownloadCount = typeof downloadCounts.$inferSelect;
+
 /**
  * Seller profiles table
  * Additional information for sellers
@@ -211,3 +317,40 @@ export const sellerProfiles = pgTable("seller_profiles", {
 
 export type SellerProfile = typeof sellerProfiles.$inferSelect;
 export type InsertSellerProfile = typeof sellerProfiles.$inferInsert;
+
+/**
+ * Seller daily sales rollup table
+ * Per-seller/per-product/per-day sales aggregates, updated in the same
+ * transaction as payment approval and refunds (see server/rollups.ts).
+ * Orders are bucketed by the UTC day they were created.
+ */
+export const sellerDailySales = pgTable(
+  "seller_daily_sales",
+  {
+    id: serial("id").primaryKey(),
+    sellerId: integer("sellerId").notNull(),
+    productId: integer("productId").notNull(),
+    day: date("day", { mode: "string" }).notNull(),
+    salesCount: integer("salesCount").default(0).notNull(),
+    revenue: numeric("revenue", { precision: 15, scale: 2 }).default("0").notNull(),
+    refundCount: integer("refundCount").default(0).notNull(),
+    refundAmount: numeric("refundAmount", { precision: 15, scale: 2 })
+      .default("0")
+      .notNull(),
+    updatedAt: timestamp("updatedAt").defaultNow().notNull(),
+  },
+  (table) => ({
+    sellerProductDayIdx: uniqueIndex("seller_daily_sales_seller_product_day_idx").on(
+      table.sellerId,
+      table.productId,
+      table.day
+    ),
+    sellerDayIdx: index("seller_daily_sales_seller_day_idx").on(
+      table.sellerId,
+      table.day
+    ),
+  })
+);
+
+export type SellerDailySales = typeof sellerDailySales.$inferSelect;
+export type InsertSellerDailySales = typeof sellerDailySales.$inferInsert;
@@ -0,0 +1,201 @@
+/**
+ * 프로세스 내 TTL/LRU 캐시
+ *
+ * Map의 삽입 순서를 LRU 순서로 사용합니다.
+ * - get 시 항목을 맨 뒤로 옮겨 최근 사용으로 표시
+ * - maxSize 초과 시 가장 오래 사용되지 않은 항목부터 제거
+ * - 항목별 만료 시간(expiresAt)이 지나면 miss로 처리
+ */
+
+export type CacheStats = {
+  size: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+};
+
+export type TtlCacheOptions = {
+  maxSize: number;
+  ttlMs: number;
+};
+
+type CacheEntry<V> = {
+  value: V;
+  expiresAt: number;
+};
+
+export class TtlCache<K, V> {
+  private readonly entries = new Map<K, CacheEntry<V>>();
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+
+  constructor(private readonly options: TtlCacheOptions) {}
+
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry || entry.expiresAt <= Date.now()) {
+      if (entry) this.entries.delete(key);
+      this.misses++;
+      return undefined;
+    }
+
+    // LRU: 최근 사용 항목을 맨 뒤로 이동
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  /**
+   * 통계에 영향을 주지 않고 유효한 항목이 있는지 확인합니다.
+   */
+  has(key: K): boolean {
+    const entry = this.entries.get(key);
+    return !!entry && entry.expiresAt > Date.now();
+  }
+
+  set(key: K, value: V, ttlMs: number = this.options.ttlMs): void {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+
+    while (this.entries.size > this.options.maxSize) {
+      const oldestKey = this.entries.keys().next().value as K;
+      this.entries.delete(oldestKey);
+      this.evictions++;
+    }
+  }
+
+  delete(key: K): boolean {
+    return this.entries.delete(key);
+  }
+
+  keys(): K[] {
+    return Array.from(this.entries.keys());
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  stats(): CacheStats {
+    return {
+      size: this.entries.size,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+    };
+  }
+}
+
+export type SwrCacheStats = CacheStats & {
+  staleHits: number;
+  coalesced: number;
+};
+
+export type SwrCacheOptions = {
+  maxSize: number;
+  /** 이 시간 동안은 저장된 값을 그대로 반환 */
+  freshMs: number;
+  /** fresh 이후 이 시간 동안은 저장된 값을 반환하면서 백그라운드에서 다시 로드 */
+  staleMs: number;
+};
+
+type SwrEntry<V> = {
+  value: V;
+  freshUntil: number;
+};
+
+/**
+ * stale-while-revalidate 캐시
+ *
+ * - 같은 키의 동시 miss는 하나의 로드 Promise를 공유 (request coalescing)
+ * - stale 항목은 즉시 반환하고 한 번만 백그라운드 갱신
+ * - delete/deleteWhere는 진행 중인 로드 결과도 저장되지 않도록 버림
+ */
+export class SwrCache<K, V> {
+  private readonly entries: TtlCache<K, SwrEntry<V>>;
+  private readonly pending = new Map<K, Promise<V>>();
+  private staleHits = 0;
+  private coalesced = 0;
+
+  constructor(private readonly options: SwrCacheOptions) {
+    this.entries = new TtlCache({
+      maxSize: options.maxSize,
+      ttlMs: options.freshMs + options.staleMs,
+    });
+  }
+
+  async get(key: K, load: () => Promise<V>): Promise<V> {
+    const entry = this.entries.get(key);
+
+    if (entry) {
+      if (entry.freshUntil <= Date.now()) {
+        this.staleHits++;
+        if (!this.pending.has(key)) {
+          this.load(key, load).catch(error => {
+            console.warn("[Cache] Background refresh failed:", error);
+          });
+        }
+      }
+      return entry.value;
+    }
+
+    const inflight = this.pending.get(key);
+    if (inflight) {
+      this.coalesced++;
+      return inflight;
+    }
+
+    return this.load(key, load);
+  }
+
+  private load(key: K, load: () => Promise<V>): Promise<V> {
+    const promise: Promise<V> = load()
+      .then(value => {
+        // 로드 중에 무효화되었다면 결과를 저장하지 않음
+        if (this.pending.get(key) === promise) {
+          this.entries.set(key, {
+            value,
+            freshUntil: Date.now() + this.options.freshMs,
+          });
+        }
+        return value;
+      })
+      .finally(() => {
+        if (this.pending.get(key) === promise) {
+          this.pending.delete(key);
+        }
+      });
+
+    this.pending.set(key, promise);
+    return promise;
+  }
+
+  delete(key: K): void {
+    this.entries.delete(key);
+    this.pending.delete(key);
+  }
+
+  deleteWhere(predicate: (key: K) => boolean): void {
+    for (const key of this.entries.keys()) {
+      if (predicate(key)) this.entries.delete(key);
+    }
+    for (const key of Array.from(this.pending.keys())) {
+      if (predicate(key)) this.pending.delete(key);
+    }
+  }
+
+  clear(): void {
+    this.entries.clear();
+    this.pending.clear();
+  }
+
+  stats(): SwrCacheStats {
+    return {
+      ...this.entries.stats(),
+      staleHits: this.staleHits,
+      coalesced: this.coalesced,
+    };
+  }
+}
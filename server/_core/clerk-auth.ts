@@ -2,6 +2,7 @@ import { clerkClient, verifyToken } from "@clerk/express";
 import type { Request } from "express";
 import type { User } from "../../drizzle/schema";
 import * as db from "../db";
+import { TtlCache, type CacheStats } from "./cache";
 import { ENV } from "./env";
 
 /**
@@ -21,14 +22,101 @@ function extractBearerToken(req: Request): string | null {
   return authHeader.slice(7);
 }
 
+/**
+ * 사용자 조회 캐시 설정
+ *
+ * - USER_CACHE_TTL_MS: 토큰 subject(Clerk user ID)별 사용자 캐시 유지 시간
+ * - SIGN_IN_WRITE_INTERVAL_MS: Clerk 프로필 동기화 및 lastSignedIn 기록 최소 간격
+ */
+const USER_CACHE_TTL_MS = 60 * 1000;
+const USER_CACHE_MAX_SIZE = 10_000;
+const SIGN_IN_WRITE_INTERVAL_MS = 5 * 60 * 1000;
+
+const userCache = new TtlCache<string, User>({
+  maxSize: USER_CACHE_MAX_SIZE,
+  ttlMs: USER_CACHE_TTL_MS,
+});
+const recentSignIns = new TtlCache<string, true>({
+  maxSize: USER_CACHE_MAX_SIZE,
+  ttlMs: SIGN_IN_WRITE_INTERVAL_MS,
+});
+// 동일 사용자에 대한 동시 캐시 miss는 하나의 조회를 공유
+const pendingLookups = new Map<string, Promise<User | null>>();
+
+/**
+ * Clerk에서 사용자 상세 정보를 가져와 DB에 upsert 합니다.
+ */
+async function syncClerkUser(clerkUserId: string): Promise<User | null> {
+  const clerkUser = await clerkClient.users.getUser(clerkUserId);
+
+  if (!clerkUser) {
+    console.warn("[Clerk Auth] User not found in Clerk");
+    return null;
+  }
+
+  // 이메일 주소 추출 (primary email 우선)
+  const primaryEmail = clerkUser.emailAddresses.find(
+    (emailAddr) => emailAddr.id === clerkUser.primaryEmailAddressId
+  );
+  const email = primaryEmail?.emailAddress ?? clerkUser.emailAddresses[0]?.emailAddress ?? null;
+
+  // 이름 추출
+  const name = clerkUser.firstName
+    ? `${clerkUser.firstName}${clerkUser.lastName ? " " + clerkUser.lastName : ""}`
+    : clerkUser.username ?? null;
+
+  // 로그인 방법 추출 (외부 계정 기반)
+  let loginMethod: string | null = null;
+  if (clerkUser.externalAccounts && clerkUser.externalAccounts.length > 0) {
+    loginMethod = clerkUser.externalAccounts[0].provider;
+  } else if (email) {
+    loginMethod = "email";
+  }
+
+  // DB에 사용자 upsert (RETURNING으로 재조회 없이 사용자 반환)
+  const user = await db.upsertUser({
+    openId: clerkUserId, // Clerk의 user ID를 openId로 사용
+    name,
+    email,
+    loginMethod,
+    lastSignedIn: new Date(),
+  });
+
+  if (!user) {
+    console.error("[Clerk Auth] Failed to upsert user to database");
+    return null;
+  }
+
+  return user;
+}
+
+/**
+ * 캐시 miss 시 사용자 조회
+ *
+ * 최근 SIGN_IN_WRITE_INTERVAL_MS 이내에 동기화된 사용자는 DB 읽기 한 번으로 끝나고,
+ * 그 외에는 Clerk 조회 + upsert(lastSignedIn 갱신)를 수행합니다.
+ */
+async function loadUser(clerkUserId: string): Promise<User | null> {
+  if (recentSignIns.has(clerkUserId)) {
+    const existing = await db.getUserByOpenId(clerkUserId);
+    if (existing) return existing;
+  }
+
+  const user = await syncClerkUser(clerkUserId);
+  if (user) {
+    recentSignIns.set(clerkUserId, true);
+  }
+  return user;
+}
+
 /**
  * Clerk 토큰을 검증하고 사용자 정보를 반환합니다.
  *
  * 흐름:
  * 1. Authorization 헤더에서 JWT 토큰 추출
- * 2. Clerk API로 토큰 검증
- * 3. 사용자 정보 조회 또는 생성
- * 4. DB에 사용자 동기화
+ * 2. Clerk SDK로 토큰 검증
+ * 3. 토큰 subject 기준 사용자 캐시 조회
+ * 4. 캐시 miss 시 DB 조회 또는 Clerk 동기화 (lastSignedIn 기록은 간격 제한)
  */
 export async function authenticateClerkRequest(req: Request): Promise<User | null> {
   const token = extractBearerToken(req);
@@ -56,50 +144,23 @@ export async function authenticateClerkRequest(req: Request): Promise<User | nul
 
     const clerkUserId = verifiedToken.sub;
 
-    // Clerk에서 사용자 상세 정보 가져오기
-    const clerkUser = await clerkClient.users.getUser(clerkUserId);
-
-    if (!clerkUser) {
-      console.warn("[Clerk Auth] User not found in Clerk");
-      return null;
+    const cached = userCache.get(clerkUserId);
+    if (cached) {
+      return cached;
     }
 
-    // 이메일 주소 추출 (primary email 우선)
-    const primaryEmail = clerkUser.emailAddresses.find(
-      (emailAddr) => emailAddr.id === clerkUser.primaryEmailAddressId
-    );
-    const email = primaryEmail?.emailAddress ?? clerkUser.emailAddresses[0]?.emailAddress ?? null;
-
-    // 이름 추출
-    const name = clerkUser.firstName
-      ? `${clerkUser.firstName}${clerkUser.lastName ? " " + clerkUser.lastName : ""}`
-      : clerkUser.username ?? null;
-
-    // 로그인 방법 추출 (외부 계정 기반)
-    let loginMethod: string | null = null;
-    if (clerkUser.externalAccounts && clerkUser.externalAccounts.length > 0) {
-      loginMethod = clerkUser.externalAccounts[0].provider;
-    } else if (email) {
-      loginMethod = "email";
+    let pending = pendingLookups.get(clerkUserId);
+    if (!pending) {
+      pending = loadUser(clerkUserId).finally(() => {
+        pendingLookups.delete(clerkUserId);
+      });
+      pendingLookups.set(clerkUserId, pending);
     }
 
-    // DB에 사용자 upsert
-    await db.upsertUser({
-      openId: clerkUserId, // Clerk의 user ID를 openId로 사용
-      name,
-      email,
-      loginMethod,
-      lastSignedIn: new Date(),
-    });
-
-    // DB에서 사용자 조회
-    const user = await db.getUserByOpenId(clerkUserId);
-
-    if (!user) {
-      console.error("[Clerk Auth] Failed to upsert user to database");
-      return null;
+    const user = await pending;
+    if (user) {
+      userCache.set(clerkUserId, user);
     }
-
     return user;
   } catch (error) {
     console.error("[Clerk Auth] Token verification failed:", error);
@@ -107,6 +168,26 @@ export async function authenticateClerkRequest(req: Request): Promise<User | nul
   }
 }
 
+/**
+ * 캐시된 사용자 정보를 제거합니다.
+ *
+ * Clerk 동기화(syncClerkUser)는 upsert 결과로 캐시를 직접 갱신하므로,
+ * 그 밖의 경로에서 users 행(역할 등)을 변경한 뒤 호출합니다. (예: sdk.ts의 OAuth 동기화)
+ */
+export function invalidateCachedUser(openId: string): void {
+  userCache.delete(openId);
+}
+
+/**
+ * 사용자 캐시 통계 (hit/miss 카운터)
+ */
+export function getUserCacheStats(): CacheStats & { pendingLookups: number } {
+  return {
+    ...userCache.stats(),
+    pendingLookups: pendingLookups.size,
+  };
+}
+
 /**
  * Clerk 사용자 정보를 기반으로 세션 데이터 반환
  */
@@ -6,25 +6,44 @@ export type TrpcContext = {
   req: CreateExpressContextOptions["req"];
   res: CreateExpressContextOptions["res"];
   user: User | null;
+  /**
+   * Lazily authenticates the request. Only procedures that need the user
+   * (protected/admin procedures, `auth.me`) call this, so public queries
+   * never pay for token verification or user lookups.
+   */
+  resolveUser?: () => Promise<User | null>;
 };
 
 export async function createContext(
   opts: CreateExpressContextOptions
 ): Promise<TrpcContext> {
-  let user: User | null = null;
+  let pending: Promise<User | null> | null = null;
 
-  try {
-    // Clerk 인증 사용
-    user = await authenticateClerkRequest(opts.req);
-  } catch (error) {
-    // Authentication is optional for public procedures.
-    console.warn("[Context] Authentication error:", error);
-    user = null;
-  }
+  const resolveUser = () => {
+    if (!pending) {
+      // Clerk 인증 사용
+      pending = authenticateClerkRequest(opts.req).catch(error => {
+        // Authentication is optional for public procedures.
+        console.warn("[Context] Authentication error:", error);
+        return null;
+      });
+    }
+    return pending;
+  };
 
   return {
     req: opts.req,
     res: opts.res,
-    user,
+    user: null,
+    resolveUser,
   };
 }
+
+/**
+ * Returns the authenticated user for the context, resolving it on first use.
+ */
+export async function resolveContextUser(ctx: TrpcContext): Promise<User | null> {
+  if (ctx.user) return ctx.user;
+  if (!ctx.resolveUser) return null;
+  return await ctx.resolveUser();
+}
@@ -0,0 +1,84 @@
+import { createHash } from "crypto";
+import type { RequestHandler } from "express";
+
+/**
+ * tRPC GET 쿼리용 HTTP 캐시 헤더
+ *
+ * 요청한 procedure가 모두 `paths`에 포함된 GET (batch) 요청에 대해
+ * 응답 본문을 모아 ETag와 Cache-Control을 붙이고, If-None-Match가 일치하면 304를 반환합니다.
+ * 사용자와 무관한 공개 데이터에만 사용해야 합니다.
+ */
+
+export type TrpcHttpCacheOptions = {
+  paths: string[];
+  cacheControl: string;
+};
+
+function toBuffer(chunk: unknown, encoding?: unknown): Buffer {
+  if (Buffer.isBuffer(chunk)) return chunk;
+  if (chunk instanceof Uint8Array) return Buffer.from(chunk);
+  return Buffer.from(
+    String(chunk),
+    typeof encoding === "string" ? (encoding as BufferEncoding) : "utf8"
+  );
+}
+
+function toEtag(body: Buffer): string {
+  return `W/"${createHash("sha1").update(body).digest("base64url")}"`;
+}
+
+export function trpcHttpCache(options: TrpcHttpCacheOptions): RequestHandler {
+  const cacheable = new Set(options.paths);
+
+  return (req, res, next) => {
+    if (req.method !== "GET") return next();
+
+    // /api/trpc/products.list,products.getById?batch=1&input=...
+    // 잘못된 퍼센트 인코딩은 tRPC가 직접 4xx로 응답하도록 그대로 넘김
+    let paths: string[];
+    try {
+      paths = decodeURIComponent(req.path.slice(1)).split(",");
+    } catch {
+      return next();
+    }
+    if (!paths.every(path => cacheable.has(path))) return next();
+
+    const chunks: Buffer[] = [];
+    const write = res.write.bind(res);
+    const end = res.end.bind(res);
+
+    res.write = ((chunk: unknown, encoding?: unknown, callback?: unknown) => {
+      chunks.push(toBuffer(chunk, encoding));
+      const done = typeof encoding === "function" ? encoding : callback;
+      if (typeof done === "function") done();
+      return true;
+    }) as typeof res.write;
+
+    res.end = ((chunk?: unknown, encoding?: unknown, callback?: unknown) => {
+      if (chunk !== undefined && chunk !== null && typeof chunk !== "function") {
+        chunks.push(toBuffer(chunk, encoding));
+      }
+      res.write = write;
+      res.end = end;
+
+      const body = Buffer.concat(chunks);
+
+      if (res.statusCode === 200) {
+        res.setHeader("ETag", toEtag(body));
+        res.setHeader("Cache-Control", options.cacheControl);
+
+        if (req.fresh) {
+          res.statusCode = 304;
+          res.removeHeader("Content-Type");
+          res.removeHeader("Content-Length");
+          return end();
+        }
+      }
+
+      res.setHeader("Content-Length", body.length);
+      return end(body);
+    }) as typeof res.end;
+
+    next();
+  };
+}
@@ -5,7 +5,10 @@ import net from "net";
 import { createExpressMiddleware } from "@trpc/server/adapters/express";
 import { registerOAuthRoutes } from "./oauth";
 import { appRouter } from "../routers";
+import { registerLicenseExportRoutes } from "../license-bulk";
+import { drainDownloadQueue } from "../downloads";
 import { createContext } from "./context";
+import { trpcHttpCache } from "./httpCache";
 import { serveStatic, setupVite } from "./vite";
 
 function isPortAvailable(port: number): Promise<boolean> {
@@ -35,6 +38,16 @@ async function startServer() {
   app.use(express.urlencoded({ limit: "50mb", extended: true }));
   // OAuth callback under /api/oauth/callback
   registerOAuthRoutes(app);
+  // License key CSV export under /api/licenses/:productId/export.csv
+  registerLicenseExportRoutes(app);
+  // Public catalog queries: ETag/304 and CDN caching (server-side cache in server/catalog.ts)
+  app.use(
+    "/api/trpc",
+    trpcHttpCache({
+      paths: ["products.list", "products.getById", "products.search"],
+      cacheControl: "public, max-age=0, s-maxage=30, stale-while-revalidate=60",
+    })
+  );
   // tRPC API
   app.use(
     "/api/trpc",
@@ -60,6 +73,17 @@ async function startServer() {
   server.listen(port, () => {
     console.log(`Server running on http://localhost:${port}/`);
   });
+
+  // Stop accepting requests, then flush buffered download events before exiting
+  const shutdown = (signal: string) => {
+    console.log(`${signal} received, shutting down`);
+    server.close();
+    drainDownloadQueue()
+      .catch(error => console.error("[Downloads] Failed to drain queue:", error))
+      .finally(() => process.exit(0));
+  };
+  process.once("SIGTERM", () => shutdown("SIGTERM"));
+  process.once("SIGINT", () => shutdown("SIGINT"));
 }
 
 startServer().catch(console.error);
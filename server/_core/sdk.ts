@@ -6,6 +6,7 @@ import type { Request } from "express";
 import { SignJWT, jwtVerify } from "jose";
 import type { User } from "../../drizzle/schema";
 import * as db from "../db";
+import { invalidateCachedUser } from "./clerk-auth";
 import { ENV } from "./env";
 import type {
   ExchangeTokenRequest,
@@ -281,6 +282,7 @@ class SDKServer {
           loginMethod: userInfo.loginMethod ?? userInfo.platform ?? null,
           lastSignedIn: signedInAt,
         });
+        invalidateCachedUser(userInfo.openId);
         user = await db.getUserByOpenId(userInfo.openId);
       } catch (error) {
         console.error("[Auth] Failed to sync user from OAuth:", error);
@@ -296,6 +298,8 @@ class SDKServer {
       openId: user.openId,
       lastSignedIn: signedInAt,
     });
+    // upsertUser can promote the owner to admin; drop any cached copy
+    invalidateCachedUser(user.openId);
 
     return user;
   }
@@ -1,4 +1,5 @@
 import { z } from "zod";
+import { getUserCacheStats } from "./clerk-auth";
 import { notifyOwner } from "./notification";
 import { adminProcedure, publicProcedure, router } from "./trpc";
 
@@ -13,6 +14,8 @@ export const systemRouter = router({
       ok: true,
     })),
 
+  authCacheStats: adminProcedure.query(() => getUserCacheStats()),
+
   notifyOwner: adminProcedure
     .input(
       z.object({
@@ -1,5 +1,8 @@
 import { describe, it, expect, beforeAll } from "vitest";
 import { appRouter } from "./routers";
+import { MAX_BATCH_VALIDATE_KEYS } from "./license";
+import { getDb } from "./db";
+import { licenseKeys, orders } from "../drizzle/schema";
 import type { TrpcContext } from "./_core/context";
 
 // Mock context for testing
@@ -29,8 +32,18 @@ function createMockContext(userId: number = 1, role: "user" | "admin" = "user"):
 describe("Products API", () => {
   it("should list products", async () => {
     const caller = appRouter.createCaller(createMockContext());
-    const result = await caller.products.list({ limit: 10, offset: 0 });
-    expect(Array.isArray(result)).toBe(true);
+    const result = await caller.products.list({ limit: 10 });
+    expect(Array.isArray(result.items)).toBe(true);
+  });
+
+  it("should search products with facets on the first page", async () => {
+    const caller = appRouter.createCaller(createMockContext());
+    const result = await caller.products.search({ query: "Test", limit: 10 });
+    expect(Array.isArray(result.items)).toBe(true);
+    if (result.facets) {
+      expect(Array.isArray(result.facets.categories)).toBe(true);
+      expect(result.facets.priceRanges.length).toBeGreaterThan(0);
+    }
   });
 
   it("should create a product for authenticated user", async () => {
@@ -53,7 +66,7 @@ describe("Products API", () => {
     const caller = appRouter.createCaller(ctx);
 
     const result = await caller.products.getMySelling();
-    expect(Array.isArray(result)).toBe(true);
+    expect(Array.isArray(result.items)).toBe(true);
   });
 });
 
@@ -69,12 +82,45 @@ describe("License API", () => {
     expect(result.message).toBe("Invalid license key");
   });
 
+  it("should validate license keys in batch, preserving input order", async () => {
+    const caller = appRouter.createCaller(createMockContext());
+
+    const result = await caller.licenses.validateKeys({
+      keys: ["INVALID-KEY-1", "INVALID-KEY-2", "INVALID-KEY-1"],
+    });
+
+    expect(result.map(r => r.key)).toEqual([
+      "INVALID-KEY-1",
+      "INVALID-KEY-2",
+      "INVALID-KEY-1",
+    ]);
+    expect(result.every(r => r.valid === false)).toBe(true);
+  });
+
+  it("should validate a near-max batch of realistic keys over POST", async () => {
+    const caller = appRouter.createCaller(createMockContext());
+    const segment = (n: number) => n.toString(16).toUpperCase().padStart(8, "0");
+    const keys = Array.from(
+      { length: MAX_BATCH_VALIDATE_KEYS },
+      (_, i) => `SOFTHUB-${segment(i)}-${segment(i * 7)}-${segment(i * 13)}`
+    );
+
+    // 약 20KB 입력: GET 쿼리 문자열로는 Node 기본 헤더 한도(16KB)를 넘음
+    expect(encodeURIComponent(JSON.stringify({ keys })).length).toBeGreaterThan(16 * 1024);
+    const procedures = appRouter._def.procedures as Record<string, { _def: { type: string } }>;
+    expect(procedures["licenses.validateKeys"]._def.type).toBe("mutation");
+
+    const result = await caller.licenses.validateKeys({ keys });
+    expect(result).toHaveLength(MAX_BATCH_VALIDATE_KEYS);
+    expect(result.map(r => r.key)).toEqual(keys);
+  });
+
   it("should get user licenses", async () => {
     const ctx = createMockContext(1);
     const caller = appRouter.createCaller(ctx);
 
     const result = await caller.licenses.getMyLicenses();
-    expect(Array.isArray(result)).toBe(true);
+    expect(Array.isArray(result.items)).toBe(true);
   });
 });
 
@@ -84,7 +130,90 @@ describe("Orders API", () => {
     const caller = appRouter.createCaller(ctx);
 
     const result = await caller.orders.getMyOrders();
-    expect(Array.isArray(result)).toBe(true);
+    expect(Array.isArray(result.items)).toBe(true);
+  });
+});
+
+describe("Downloads API", () => {
+  it("should refuse a paid license key once it reaches its activation limit", async () => {
+    const sellerId = 888001;
+    const buyerId = 888002;
+    const seller = appRouter.createCaller(createMockContext(sellerId));
+    const buyer = appRouter.createCaller(createMockContext(buyerId));
+
+    const product = await seller.products.create({
+      title: "Activation Limit Product",
+      price: "10.00",
+      licenseType: "perpetual",
+    });
+
+    // approvePayment와 같은 형태의 결제 완료 주문과 라이선스 키
+    const db = await getDb();
+    if (!db) throw new Error("Database not available");
+    const [order] = await db
+      .insert(orders)
+      .values({
+        productId: product.id,
+        sellerId,
+        buyerId,
+        unitPrice: product.price,
+        totalPrice: product.price,
+        status: "completed",
+        transactionId: `test-payment-${product.id}`,
+      })
+      .returning();
+    const [license] = await db
+      .insert(licenseKeys)
+      .values({
+        key: `SOFTHUB-TEST-${product.id}-${Date.now()}`,
+        productId: product.id,
+        buyerId,
+        orderId: order.id,
+        status: "active",
+        activatedAt: new Date(),
+        maxActivations: 2,
+      })
+      .returning();
+
+    const download = () =>
+      buyer.downloads.recordDownload({ productId: product.id, licenseKeyId: license.id });
+
+    await expect(download()).resolves.toMatchObject({ success: true });
+    await expect(download()).resolves.toMatchObject({ success: true });
+    await expect(download()).rejects.toThrow("Activation limit reached");
+  });
+
+  it("should refuse downloads without a paid order", async () => {
+    const seller = appRouter.createCaller(createMockContext(888003));
+    const product = await seller.products.create({
+      title: "Unpaid Download Product",
+      price: "10.00",
+      licenseType: "perpetual",
+    });
+
+    const other = appRouter.createCaller(createMockContext(888004));
+    await expect(
+      other.downloads.recordDownload({ productId: product.id })
+    ).rejects.toThrow("Product not purchased");
+    await expect(
+      seller.downloads.recordDownload({ productId: product.id })
+    ).resolves.toMatchObject({ success: true });
+  });
+});
+
+describe("Seller Stats API", () => {
+  it("should return totals and a daily series for a date range", async () => {
+    const ctx = createMockContext(1);
+    const caller = appRouter.createCaller(ctx);
+
+    const result = await caller.seller.stats({
+      from: new Date("2025-01-01"),
+      to: new Date("2025-01-31"),
+    });
+
+    expect(Array.isArray(result.series)).toBe(true);
+    expect(typeof result.totals.revenue).toBe("number");
+    expect(result.series.every(point => point.day >= "2025-01-01" && point.day <= "2025-01-31")).toBe(true);
   });
 });
 
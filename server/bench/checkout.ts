@@ -0,0 +1,114 @@
+import { performance } from "perf_hooks";
+import { startMockTossServer } from "./toss-mock";
+
+/**
+ * 결제 승인(checkout) 벤치마크
+ *
+ * 로컬 Toss mock 서버와 실제 PostgreSQL(DATABASE_URL)로 approvePayment 처리량을 측정합니다.
+ * 1. 벤치마크용 제품과 pending 주문 ORDERS개 생성
+ * 2. CONCURRENCY개씩 동시에 승인 → confirms/sec, p50/p99 지연
+ * 3. 같은 paymentKey로 다시 승인 → 멱등 재요청(alreadyProcessed) 처리 속도
+ *
+ * 실행: DATABASE_URL=... ORDERS=2000 CONCURRENCY=50 pnpm bench:checkout
+ */
+
+const ORDERS = parseInt(process.env.ORDERS || "1000");
+const CONCURRENCY = parseInt(process.env.CONCURRENCY || "50");
+const BENCH_USER_ID = 9_000_001;
+const BENCH_SELLER_ID = 9_000_002;
+
+function percentile(sorted: number[], p: number): number {
+  if (sorted.length === 0) return 0;
+  const index = Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1);
+  return sorted[Math.max(0, index)];
+}
+
+async function runPool<T>(
+  items: T[],
+  concurrency: number,
+  worker: (item: T) => Promise<void>
+) {
+  let next = 0;
+  const runners = Array.from({ length: Math.min(concurrency, items.length) }, async () => {
+    while (next < items.length) {
+      await worker(items[next++]);
+    }
+  });
+  await Promise.all(runners);
+}
+
+function report(label: string, latencies: number[], elapsedMs: number, failures: number) {
+  const sorted = [...latencies].sort((a, b) => a - b);
+  console.log(
+    `[Bench] ${label}: ${latencies.length} ok, ${failures} failed, ` +
+      `${((latencies.length / elapsedMs) * 1000).toFixed(1)} confirms/sec, ` +
+      `p50 ${percentile(sorted, 50).toFixed(1)}ms, p99 ${percentile(sorted, 99).toFixed(1)}ms`
+  );
+}
+
+async function main() {
+  if (!process.env.DATABASE_URL) {
+    throw new Error("DATABASE_URL is required");
+  }
+
+  const mock = await startMockTossServer();
+  // payment.ts는 로드 시점에 TOSS_API_URL을 읽으므로 동적 import 전에 설정
+  process.env.TOSS_API_URL = mock.url;
+
+  const { approvePayment } = await import("../payment");
+  const { createOrder, createProduct, getDb } = await import("../db");
+  if (!(await getDb())) throw new Error("Database not available");
+
+  const product = await createProduct({
+    sellerId: BENCH_SELLER_ID,
+    title: `Checkout Bench ${Date.now()}`,
+    price: "10000.00",
+    currency: "KRW",
+  });
+
+  console.log(`[Bench] Seeding ${ORDERS} pending orders for product ${product.id}`);
+  const payments: Array<{ paymentKey: string; orderId: string }> = [];
+  for (let i = 0; i < ORDERS; i++) {
+    const order = await createOrder({
+      buyerId: BENCH_USER_ID,
+      sellerId: BENCH_SELLER_ID,
+      productId: product.id,
+      unitPrice: product.price,
+      totalPrice: product.price,
+      currency: product.currency,
+      status: "pending",
+    });
+    payments.push({
+      paymentKey: `bench_${order.id}_${Date.now()}`,
+      orderId: `${order.id}-${Date.now()}`,
+    });
+  }
+
+  const amount = Math.round(parseFloat(product.price));
+
+  for (const pass of ["confirm", "idempotent replay"]) {
+    const latencies: number[] = [];
+    let failures = 0;
+    const started = performance.now();
+
+    await runPool(payments, CONCURRENCY, async ({ paymentKey, orderId }) => {
+      const t0 = performance.now();
+      const result = await approvePayment(paymentKey, orderId, amount, BENCH_USER_ID);
+      if (result.success) {
+        latencies.push(performance.now() - t0);
+      } else {
+        failures++;
+      }
+    });
+
+    report(pass, latencies, performance.now() - started, failures);
+  }
+
+  await mock.close();
+  process.exit(0);
+}
+
+main().catch((error) => {
+  console.error("[Bench] Failed:", error);
+  process.exit(1);
+});
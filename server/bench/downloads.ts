@@ -0,0 +1,143 @@
+import { createServer } from "http";
+import type { AddressInfo } from "net";
+import { performance } from "perf_hooks";
+
+/**
+ * 다운로드 기록 벤치마크
+ *
+ * 실제 PostgreSQL(DATABASE_URL)과 로컬 mock 저장소 프록시로 초당 처리 가능한 다운로드 수를 비교합니다.
+ * 1. before: 요청마다 downloads 단일 행 INSERT (recordDownload) + 저장소 프록시에 URL 요청
+ * 2. after: 구매 확인 + 이벤트 큐 + 서명 URL 캐시 (recordDownloadEvent, 제한 없는 제품)
+ * 3. after + maxDownloads: download_counts 원자적 카운터 포함
+ * after 결과에는 종료 시 큐 drain 시간까지 포함합니다.
+ * 벤치마크 사용자마다 결제 승인된 주문(transactionId 포함)을 만들어 구매 확인을 통과시킵니다.
+ *
+ * 실행: DATABASE_URL=... DOWNLOADS=20000 CONCURRENCY=100 pnpm bench:downloads
+ */
+
+const DOWNLOADS = parseInt(process.env.DOWNLOADS || "10000");
+const CONCURRENCY = parseInt(process.env.CONCURRENCY || "100");
+const BENCH_SELLER_ID = 9_000_002;
+const BENCH_USERS = 1000;
+const STORAGE_LATENCY_MS = parseInt(process.env.STORAGE_LATENCY_MS || "20");
+const BENCH_STORAGE_KEY = "bench/downloads/app.zip";
+
+/**
+ * 저장소 프록시 mock: GET /v1/storage/downloadUrl → 1시간짜리 S3 형식 서명 URL
+ */
+async function startMockStorageServer() {
+  const server = createServer((req, res) => {
+    const url = new URL(req.url ?? "/", "http://localhost");
+    setTimeout(() => {
+      const signedAt = new Date().toISOString().replace(/[-:]/g, "").replace(/\.\d{3}/, "");
+      res.writeHead(200, { "Content-Type": "application/json" });
+      res.end(
+        JSON.stringify({
+          url: `https://storage.example.com/${url.searchParams.get("path")}?X-Amz-Date=${signedAt}&X-Amz-Expires=3600&X-Amz-Signature=mock`,
+        })
+      );
+    }, STORAGE_LATENCY_MS);
+  });
+  await new Promise<void>(resolve => server.listen(0, resolve));
+  return `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+}
+
+async function runPool(count: number, concurrency: number, worker: (i: number) => Promise<void>) {
+  let next = 0;
+  const runners = Array.from({ length: Math.min(concurrency, count) }, async () => {
+    while (next < count) {
+      await worker(next++);
+    }
+  });
+  await Promise.all(runners);
+}
+
+async function measure(label: string, worker: (i: number) => Promise<void>, after?: () => Promise<void>) {
+  const started = performance.now();
+  await runPool(DOWNLOADS, CONCURRENCY, worker);
+  const requestMs = performance.now() - started;
+  await after?.();
+  const totalMs = performance.now() - started;
+
+  console.log(
+    `[Bench] ${label}: ${((DOWNLOADS / requestMs) * 1000).toFixed(0)} downloads/sec on the request path, ` +
+      `${((DOWNLOADS / totalMs) * 1000).toFixed(0)} downloads/sec including flush`
+  );
+}
+
+async function main() {
+  if (!process.env.DATABASE_URL) {
+    throw new Error("DATABASE_URL is required");
+  }
+
+  // storage.ts는 로드 시점에 저장소 설정을 읽으므로 동적 import 전에 설정
+  const storageUrl = await startMockStorageServer();
+  process.env.BUILT_IN_FORGE_API_URL = storageUrl;
+  process.env.BUILT_IN_FORGE_API_KEY = "bench";
+
+  const { createProduct, getDb, recordDownload } = await import("../db");
+  const { drainDownloadQueue, recordDownloadEvent } = await import("../downloads");
+  const { orders } = await import("../../drizzle/schema");
+
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+
+  const userId = (i: number) => 8_000_000 + (i % BENCH_USERS);
+
+  const createBenchProduct = async (maxDownloads: number | null) => {
+    const product = await createProduct({
+      sellerId: BENCH_SELLER_ID,
+      title: `Download Bench ${Date.now()}`,
+      price: "0",
+      downloadUrl: BENCH_STORAGE_KEY,
+      maxDownloads,
+    });
+    await db.insert(orders).values(
+      Array.from({ length: BENCH_USERS }, (_, i) => ({
+        buyerId: userId(i),
+        sellerId: BENCH_SELLER_ID,
+        productId: product.id,
+        unitPrice: product.price,
+        totalPrice: product.price,
+        status: "completed" as const,
+        transactionId: `bench-${product.id}-${i}`,
+      }))
+    );
+    return product.id;
+  };
+
+  const unlimitedId = await createBenchProduct(null);
+  const limitedId = await createBenchProduct(DOWNLOADS);
+
+  // 이전 경로: 기록 INSERT와 저장소 프록시 URL 요청이 매번 요청 경로에서 발생
+  await measure("before (INSERT + URL request per download)", async (i) => {
+    await recordDownload({ userId: userId(i), productId: unlimitedId });
+    const response = await fetch(
+      `${storageUrl}/v1/storage/downloadUrl?path=${encodeURIComponent(BENCH_STORAGE_KEY)}`
+    );
+    await response.json();
+  });
+
+  await measure(
+    "after (write-behind queue + signed URL cache)",
+    async (i) => {
+      await recordDownloadEvent({ userId: userId(i), productId: unlimitedId });
+    },
+    drainDownloadQueue
+  );
+
+  await measure(
+    "after + maxDownloads counter",
+    async (i) => {
+      await recordDownloadEvent({ userId: userId(i), productId: limitedId });
+    },
+    drainDownloadQueue
+  );
+
+  process.exit(0);
+}
+
+main().catch((error) => {
+  console.error("[Bench] Failed:", error);
+  process.exit(1);
+});
@@ -0,0 +1,123 @@
+import { createServer, type Server } from "http";
+import type { AddressInfo } from "net";
+import { pathToFileURL } from "url";
+
+/**
+ * 로컬 Toss Payments mock 서버
+ *
+ * 결제 승인(POST /v1/payments/:paymentKey)과 취소(POST /v1/payments/:paymentKey/cancel)만 구현합니다.
+ * - Idempotency-Key가 같은 요청에는 최초 응답을 그대로 반환
+ * - 이미 승인된 paymentKey를 다른 키로 다시 승인하면 ALREADY_PROCESSED_PAYMENT
+ * - MOCK_TOSS_LATENCY_MS로 Toss 응답 지연을 흉내냄
+ *
+ * 단독 실행: pnpm mock:toss  (PORT 기본값 4010)
+ */
+
+type MockResponse = { status: number; body: unknown };
+
+export type MockTossServer = {
+  server: Server;
+  url: string;
+  close: () => Promise<void>;
+};
+
+function readJson(req: import("http").IncomingMessage): Promise<any> {
+  return new Promise((resolve, reject) => {
+    let data = "";
+    req.on("data", chunk => (data += chunk));
+    req.on("end", () => {
+      try {
+        resolve(data ? JSON.parse(data) : {});
+      } catch (error) {
+        reject(error);
+      }
+    });
+    req.on("error", reject);
+  });
+}
+
+export async function startMockTossServer(
+  port = 0,
+  latencyMs = Number(process.env.MOCK_TOSS_LATENCY_MS ?? 50)
+): Promise<MockTossServer> {
+  const approved = new Set<string>();
+  const idempotentResponses = new Map<string, MockResponse>();
+
+  const handle = async (path: string, body: any): Promise<MockResponse> => {
+    const match = path.match(/^\/v1\/payments\/([^/]+)(\/cancel)?$/);
+    if (!match) {
+      return { status: 404, body: { code: "NOT_FOUND", message: "Not found" } };
+    }
+
+    const [, paymentKey, cancel] = match;
+
+    if (cancel) {
+      if (!approved.delete(paymentKey)) {
+        return {
+          status: 400,
+          body: { code: "NOT_CANCELABLE_PAYMENT", message: "취소할 수 없는 결제입니다." },
+        };
+      }
+      return {
+        status: 200,
+        body: { paymentKey, status: "CANCELED", cancels: [{ cancelReason: body.cancelReason }] },
+      };
+    }
+
+    if (approved.has(paymentKey)) {
+      return {
+        status: 400,
+        body: { code: "ALREADY_PROCESSED_PAYMENT", message: "이미 처리된 결제 입니다." },
+      };
+    }
+
+    approved.add(paymentKey);
+    return {
+      status: 200,
+      body: {
+        paymentKey,
+        orderId: body.orderId,
+        totalAmount: body.amount,
+        status: "DONE",
+        approvedAt: new Date().toISOString(),
+      },
+    };
+  };
+
+  const server = createServer(async (req, res) => {
+    try {
+      const body = await readJson(req);
+      await new Promise(resolve => setTimeout(resolve, latencyMs));
+
+      const idempotencyKey = req.headers["idempotency-key"];
+      const cacheKey = typeof idempotencyKey === "string" ? idempotencyKey : null;
+
+      let response = cacheKey ? idempotentResponses.get(cacheKey) : undefined;
+      if (!response) {
+        response = await handle(req.url ?? "", body);
+        if (cacheKey) idempotentResponses.set(cacheKey, response);
+      }
+
+      res.writeHead(response.status, { "Content-Type": "application/json" });
+      res.end(JSON.stringify(response.body));
+    } catch (error) {
+      res.writeHead(400, { "Content-Type": "application/json" });
+      res.end(JSON.stringify({ code: "INVALID_REQUEST", message: String(error) }));
+    }
+  });
+
+  await new Promise<void>(resolve => server.listen(port, resolve));
+  const { port: boundPort } = server.address() as AddressInfo;
+
+  return {
+    server,
+    url: `http://127.0.0.1:${boundPort}/v1/payments`,
+    close: () => new Promise(resolve => server.close(() => resolve())),
+  };
+}
+
+if (import.meta.url === pathToFileURL(process.argv[1] ?? "").href) {
+  startMockTossServer(parseInt(process.env.PORT || "4010"))
+    .then(({ url }) => console.log(`[Toss Mock] Listening on ${url}`))
+    .catch(console.error);
+}
@@ -0,0 +1,88 @@
+import { describe, it, expect, vi, afterEach } from "vitest";
+import { SwrCache, TtlCache } from "./_core/cache";
+
+describe("TtlCache", () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("should count hits and misses", () => {
+    const cache = new TtlCache<string, number>({ maxSize: 10, ttlMs: 1000 });
+
+    expect(cache.get("a")).toBeUndefined();
+    cache.set("a", 1);
+    expect(cache.get("a")).toBe(1);
+
+    expect(cache.stats()).toMatchObject({ size: 1, hits: 1, misses: 1 });
+  });
+
+  it("should expire entries after ttl", () => {
+    vi.useFakeTimers();
+    const cache = new TtlCache<string, number>({ maxSize: 10, ttlMs: 1000 });
+
+    cache.set("a", 1);
+    vi.advanceTimersByTime(999);
+    expect(cache.get("a")).toBe(1);
+    vi.advanceTimersByTime(1);
+    expect(cache.get("a")).toBeUndefined();
+    expect(cache.has("a")).toBe(false);
+  });
+
+  it("should evict the least recently used entry", () => {
+    const cache = new TtlCache<string, number>({ maxSize: 2, ttlMs: 1000 });
+
+    cache.set("a", 1);
+    cache.set("b", 2);
+    cache.get("a");
+    cache.set("c", 3);
+
+    expect(cache.has("a")).toBe(true);
+    expect(cache.has("b")).toBe(false);
+    expect(cache.has("c")).toBe(true);
+    expect(cache.stats().evictions).toBe(1);
+  });
+});
+
+describe("SwrCache", () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("should share one load between concurrent misses", async () => {
+    const cache = new SwrCache<string, number>({ maxSize: 10, freshMs: 1000, staleMs: 1000 });
+    const load = vi.fn(async () => 1);
+
+    const results = await Promise.all([cache.get("a", load), cache.get("a", load), cache.get("a", load)]);
+
+    expect(results).toEqual([1, 1, 1]);
+    expect(load).toHaveBeenCalledTimes(1);
+    expect(cache.stats().coalesced).toBe(2);
+  });
+
+  it("should serve stale values while refreshing in the background", async () => {
+    // freshMs 0: 저장 직후부터 stale
+    const cache = new SwrCache<string, number>({ maxSize: 10, freshMs: 0, staleMs: 5000 });
+
+    await cache.get("a", async () => 1);
+
+    const load = vi.fn(async () => 2);
+    expect(await cache.get("a", load)).toBe(1);
+    expect(await cache.get("a", load)).toBe(1);
+    expect(load).toHaveBeenCalledTimes(1);
+
+    await new Promise(resolve => setTimeout(resolve, 0));
+    expect(await cache.get("a", load)).toBe(2);
+  });
+
+  it("should not store a load that was invalidated while in flight", async () => {
+    const cache = new SwrCache<string, number>({ maxSize: 10, freshMs: 1000, staleMs: 1000 });
+    let resolveLoad: (value: number) => void = () => {};
+
+    const first = cache.get("a", () => new Promise<number>(resolve => (resolveLoad = resolve)));
+    cache.delete("a");
+    resolveLoad(1);
+    await first;
+
+    expect(await cache.get("a", async () => 2)).toBe(2);
+  });
+});
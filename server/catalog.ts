@@ -0,0 +1,123 @@
+import { SwrCache } from "./_core/cache";
+import {
+  getProductWithRatingById,
+  getProducts,
+  getProductsByCategory,
+  type ProductWithRating,
+} from "./db";
+import { pageLimit, type Page, type PageParams } from "./pagination";
+
+/**
+ * 카탈로그 읽기 캐시
+ *
+ * products.list / products.getById는 공개 엔드포인트이고 쓰기보다 읽기가 훨씬 많으므로
+ * stale-while-revalidate 캐시로 DB 조회를 줄입니다.
+ * - 동시에 들어온 같은 키의 miss는 하나의 쿼리를 공유
+ * - 제품 생성: 해당 제품(존재하지 않는다고 캐시된 null)과 전체/해당 카테고리 목록의 첫 페이지만 제거
+ *   (keyset 커서 이후 페이지는 변하지 않음)
+ * - 제품 수정/삭제: 해당 제품과 전체/관련 카테고리 목록 제거
+ * - 리뷰 변경: 해당 제품 상세만 제거, 목록의 평점은 LIST_FRESH_MS 안에 갱신
+ *
+ * 프로세스 내 캐시이므로 여러 인스턴스에서는 각 인스턴스가 fresh 기간 동안 이전 값을 볼 수 있습니다.
+ */
+
+const PRODUCT_FRESH_MS = 60 * 1000;
+const LIST_FRESH_MS = 15 * 1000;
+const STALE_MS = 5 * 60 * 1000;
+
+const productCache = new SwrCache<number, ProductWithRating | null>({
+  maxSize: 10_000,
+  freshMs: PRODUCT_FRESH_MS,
+  staleMs: STALE_MS,
+});
+
+const listCache = new SwrCache<string, Page<ProductWithRating>>({
+  maxSize: 2000,
+  freshMs: LIST_FRESH_MS,
+  staleMs: STALE_MS,
+});
+
+type ListKey = [category: string | null, cursor: string | null, limit: number];
+
+function toListKey(category: string | undefined, page: PageParams): string {
+  const key: ListKey = [category ?? null, page.cursor ?? null, pageLimit(page)];
+  return JSON.stringify(key);
+}
+
+function parseListKey(key: string): ListKey {
+  return JSON.parse(key) as ListKey;
+}
+
+/**
+ * 제품 목록 (전체 또는 카테고리별)
+ */
+export async function getCatalogPage(
+  category: string | undefined,
+  page: PageParams = {}
+): Promise<Page<ProductWithRating>> {
+  return await listCache.get(toListKey(category, page), () =>
+    category ? getProductsByCategory(category, page) : getProducts(page)
+  );
+}
+
+/**
+ * 제품 상세 (평점 포함)
+ */
+export async function getCatalogProduct(
+  productId: number
+): Promise<ProductWithRating | null> {
+  return await productCache.get(productId, () =>
+    getProductWithRatingById(productId)
+  );
+}
+
+function invalidateLists(
+  categories: Array<string | null | undefined>,
+  firstPageOnly: boolean
+) {
+  const affected = new Set<string | null>([null]);
+  for (const category of categories) {
+    if (category) affected.add(category);
+  }
+
+  listCache.deleteWhere(key => {
+    const [category, cursor] = parseListKey(key);
+    return affected.has(category) && (!firstPageOnly || cursor === null);
+  });
+}
+
+/**
+ * 새 제품이 추가되었을 때 호출합니다.
+ */
+export function invalidateCatalogForCreate(
+  productId: number,
+  category: string | null | undefined
+) {
+  productCache.delete(productId);
+  invalidateLists([category], true);
+}
+
+/**
+ * 제품이 수정/삭제되었을 때 호출합니다. 카테고리가 바뀌었다면 이전/새 카테고리를 모두 넘깁니다.
+ */
+export function invalidateCatalogProduct(
+  productId: number,
+  categories: Array<string | null | undefined>
+) {
+  productCache.delete(productId);
+  invalidateLists(categories, false);
+}
+
+/**
+ * 리뷰로 제품 평점이 바뀌었을 때 호출합니다.
+ */
+export function invalidateCatalogRating(productId: number) {
+  productCache.delete(productId);
+}
+
+export function getCatalogCacheStats() {
+  return {
+    products: productCache.stats(),
+    lists: listCache.stats(),
+  };
+}
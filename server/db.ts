@@ -1,8 +1,9 @@
-import { eq, and, desc, asc, like, gte, lte, sql } from "drizzle-orm";
+import { eq, and, desc, asc, like, gte, lte, sql, inArray, getTableColumns } from "drizzle-orm";
 import { drizzle } from "drizzle-orm/postgres-js";
 import postgres from "postgres";
 import {
   InsertUser,
+  User,
   users,
   products,
   licenseKeys,
@@ -12,16 +13,35 @@ import {
   reviews,
   InsertProduct,
   InsertLicenseKey,
+  LicenseKey,
   InsertOrder,
   InsertDownload,
   InsertSellerProfile,
   InsertReview,
+  Order,
+  Product,
+  Review,
+  productRatings,
+  ProductRating,
 } from "../drizzle/schema";
 import { ENV } from './_core/env';
+import {
+  afterCursor,
+  afterKeyset,
+  pageLimit,
+  toKeysetPage,
+  toPage,
+  type Page,
+  type PageParams,
+} from "./pagination";
 
 let _db: ReturnType<typeof drizzle> | null = null;
 let _client: ReturnType<typeof postgres> | null = null;
 
+export type Db = NonNullable<typeof _db>;
+export type DbTransaction = Parameters<Parameters<Db["transaction"]>[0]>[0];
+export type DbExecutor = Db | DbTransaction;
+
 // Lazily create the drizzle instance so local tooling can run without a DB.
 export async function getDb() {
   if (!_db && process.env.DATABASE_URL) {
@@ -36,7 +56,7 @@ export async function getDb() {
   return _db;
 }
 
-export async function upsertUser(user: InsertUser): Promise<void> {
+export async function upsertUser(user: InsertUser): Promise<User | undefined> {
   if (!user.openId) {
     throw new Error("User openId is required for upsert");
   }
@@ -44,7 +64,7 @@ export async function upsertUser(user: InsertUser): Promise<void> {
   const db = await getDb();
   if (!db) {
     console.warn("[Database] Cannot upsert user: database not available");
-    return;
+    return undefined;
   }
 
   try {
@@ -86,10 +106,16 @@ export async function upsertUser(user: InsertUser): Promise<void> {
       updateSet.lastSignedIn = new Date();
     }
 
-    await db.insert(users).values(values).onConflictDoUpdate({
-      target: users.openId,
-      set: updateSet,
-    });
+    const result = await db
+      .insert(users)
+      .values(values)
+      .onConflictDoUpdate({
+        target: users.openId,
+        set: updateSet,
+      })
+      .returning();
+
+    return result[0];
   } catch (error) {
     console.error("[Database] Failed to upsert user:", error);
     throw error;
@@ -108,18 +134,83 @@ export async function getUserByOpenId(openId: string) {
   return result.length > 0 ? result[0] : undefined;
 }
 
+// Product rating aggregates
+export type RatingSummary = {
+  count: number;
+  average: number | null;
+  /** Review counts for 1 through 5 stars. */
+  histogram: [number, number, number, number, number];
+};
+
+export type ProductWithRating = Product & { rating: RatingSummary };
+
+export function toRatingSummary(
+  aggregate: Omit<ProductRating, "productId" | "updatedAt"> | null
+): RatingSummary {
+  if (!aggregate) {
+    return { count: 0, average: null, histogram: [0, 0, 0, 0, 0] };
+  }
+  return {
+    count: aggregate.ratingCount,
+    average: aggregate.ratingCount > 0 ? aggregate.ratingSum / aggregate.ratingCount : null,
+    histogram: [
+      aggregate.stars1,
+      aggregate.stars2,
+      aggregate.stars3,
+      aggregate.stars4,
+      aggregate.stars5,
+    ],
+  };
+}
+
+// Product columns without the generated search document.
+const { searchVector: _searchVector, ...productColumnsWithoutSearch } = getTableColumns(products);
+export const productColumns = productColumnsWithoutSearch;
+
+export const productRatingColumns = {
+  ratingCount: productRatings.ratingCount,
+  ratingSum: productRatings.ratingSum,
+  stars1: productRatings.stars1,
+  stars2: productRatings.stars2,
+  stars3: productRatings.stars3,
+  stars4: productRatings.stars4,
+  stars5: productRatings.stars5,
+};
+
+// Selects products with their rating aggregates in a single LEFT JOIN.
+function selectProductsWithRating(db: Db) {
+  return db
+    .select({ product: productColumns, rating: productRatingColumns })
+    .from(products)
+    .leftJoin(productRatings, eq(productRatings.productId, products.id));
+}
+
+export function toProductWithRating(row: {
+  product: Product;
+  rating: Omit<ProductRating, "productId" | "updatedAt"> | null;
+}): ProductWithRating {
+  return { ...row.product, rating: toRatingSummary(row.rating) };
+}
+
 // Product queries
-export async function getProducts(limit = 20, offset = 0) {
+export async function getProducts(
+  page: PageParams = {}
+): Promise<Page<ProductWithRating>> {
   const db = await getDb();
-  if (!db) return [];
+  if (!db) return { items: [], nextCursor: null };
 
-  return await db
-    .select()
-    .from(products)
-    .where(eq(products.active, true))
-    .orderBy(desc(products.createdAt))
-    .limit(limit)
-    .offset(offset);
+  const limit = pageLimit(page);
+  const rows = await selectProductsWithRating(db)
+    .where(
+      and(
+        eq(products.active, true),
+        afterCursor(products.createdAt, products.id, page.cursor)
+      )
+    )
+    .orderBy(desc(products.createdAt), desc(products.id))
+    .limit(limit + 1);
+
+  return toPage(rows.map(toProductWithRating), limit);
 }
 
 export async function getProductById(productId: number) {
@@ -127,7 +218,7 @@ export async function getProductById(productId: number) {
   if (!db) return null;
 
   const result = await db
-    .select()
+    .select(productColumns)
     .from(products)
     .where(eq(products.id, productId))
     .limit(1);
@@ -135,40 +226,82 @@ export async function getProductById(productId: number) {
   return result.length > 0 ? result[0] : null;
 }
 
-export async function getProductsByCategory(category: string, limit = 20) {
+export async function getProductWithRatingById(
+  productId: number
+): Promise<ProductWithRating | null> {
   const db = await getDb();
-  if (!db) return [];
+  if (!db) return null;
 
-  return await db
-    .select()
-    .from(products)
+  const result = await selectProductsWithRating(db)
+    .where(eq(products.id, productId))
+    .limit(1);
+
+  return result.length > 0 ? toProductWithRating(result[0]) : null;
+}
+
+export async function getProductsByCategory(
+  category: string,
+  page: PageParams = {}
+): Promise<Page<ProductWithRating>> {
+  const db = await getDb();
+  if (!db) return { items: [], nextCursor: null };
+
+  const limit = pageLimit(page);
+  const rows = await selectProductsWithRating(db)
     .where(
       and(
         eq(products.category, category),
-        eq(products.active, true)
+        eq(products.active, true),
+        afterCursor(products.createdAt, products.id, page.cursor)
       )
     )
-    .orderBy(desc(products.createdAt))
-    .limit(limit);
+    .orderBy(desc(products.createdAt), desc(products.id))
+    .limit(limit + 1);
+
+  return toPage(rows.map(toProductWithRating), limit);
 }
 
-export async function getSellerProducts(sellerId: number) {
+export async function getSellerProducts(
+  sellerId: number,
+  page: PageParams = {}
+): Promise<Page<Product>> {
   const db = await getDb();
-  if (!db) return [];
+  if (!db) return { items: [], nextCursor: null };
 
-  return await db
-    .select()
+  const limit = pageLimit(page);
+  const rows = await db
+    .select(productColumns)
+    .from(products)
+    .where(
+      and(
+        eq(products.sellerId, sellerId),
+        afterCursor(products.createdAt, products.id, page.cursor)
+      )
+    )
+    .orderBy(desc(products.createdAt), desc(products.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
+}
+
+export async function countActiveSellerProducts(sellerId: number) {
+  const db = await getDb();
+  if (!db) return 0;
+
+  const [result] = await db
+    .select({ count: sql<number>`COUNT(*)::int` })
     .from(products)
-    .where(eq(products.sellerId, sellerId))
-    .orderBy(desc(products.createdAt));
+    .where(and(eq(products.sellerId, sellerId), eq(products.active, true)));
+
+  return result.count;
 }
 
 export async function createProduct(product: InsertProduct) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
 
-  const result = await db.insert(products).values(product);
-  return result;
+  const [created] = await db.insert(products).values(product).returning(productColumns);
+  return created;
 }
 
 export async function updateProduct(
@@ -192,6 +325,110 @@ export async function generateLicenseKey(licenseKey: InsertLicenseKey) {
   return await db.insert(licenseKeys).values(licenseKey);
 }
 
+/**
+ * Inserts license keys with chunked multi-row INSERT ... RETURNING statements
+ * instead of one round trip per key.
+ */
+export async function insertLicenseKeysBulk(
+  rows: InsertLicenseKey[],
+  chunkSize = 1000
+) {
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+
+  const inserted: { id: number; key: string }[] = [];
+  for (let i = 0; i < rows.length; i += chunkSize) {
+    const result = await db
+      .insert(licenseKeys)
+      .values(rows.slice(i, i + chunkSize))
+      .returning({ id: licenseKeys.id, key: licenseKeys.key });
+    inserted.push(...result);
+  }
+  return inserted;
+}
+
+export type LicenseKeyExportRow = Pick<
+  LicenseKey,
+  "id" | "key" | "status" | "buyerId" | "orderId" | "activatedAt" | "expiresAt" | "createdAt"
+>;
+
+/**
+ * Streams a product's license keys in batches using a server-side cursor,
+ * so exports never hold the whole inventory in memory.
+ */
+export async function* streamLicenseKeysByProductId(
+  productId: number,
+  batchSize = 1000
+): AsyncGenerator<LicenseKeyExportRow[]> {
+  const db = await getDb();
+  if (!db || !_client) return;
+
+  const query = db
+    .select({
+      id: licenseKeys.id,
+      key: licenseKeys.key,
+      status: licenseKeys.status,
+      buyerId: licenseKeys.buyerId,
+      orderId: licenseKeys.orderId,
+      activatedAt: licenseKeys.activatedAt,
+      expiresAt: licenseKeys.expiresAt,
+      createdAt: licenseKeys.createdAt,
+    })
+    .from(licenseKeys)
+    .where(eq(licenseKeys.productId, productId))
+    .orderBy(asc(licenseKeys.id))
+    .toSQL();
+
+  const cursor = _client
+    .unsafe(query.sql, query.params as any[])
+    .cursor(batchSize);
+
+  // unsafe() bypasses drizzle's result mapping and the client passes
+  // timestamps through as strings, so map them with the column codecs.
+  const toDate = (column: { mapFromDriverValue(value: string): Date }, value: unknown) =>
+    value === null ? null : column.mapFromDriverValue(value as string);
+
+  for await (const rows of cursor) {
+    yield rows.map((row) => ({
+      id: row.id,
+      key: row.key,
+      status: row.status,
+      buyerId: row.buyerId,
+      orderId: row.orderId,
+      activatedAt: toDate(licenseKeys.activatedAt, row.activatedAt),
+      expiresAt: toDate(licenseKeys.expiresAt, row.expiresAt),
+      createdAt: toDate(licenseKeys.createdAt, row.createdAt)!,
+    }));
+  }
+}
+
+export async function countLicenseKeysBySellerId(sellerId: number) {
+  const counts = { total: 0, active: 0, inactive: 0, revoked: 0, expired: 0 };
+
+  const db = await getDb();
+  if (!db) return counts;
+
+  const rows = await db
+    .select({
+      status: licenseKeys.status,
+      count: sql<number>`COUNT(*)::int`,
+    })
+    .from(licenseKeys)
+    .where(
+      inArray(
+        licenseKeys.productId,
+        db.select({ id: products.id }).from(products).where(eq(products.sellerId, sellerId))
+      )
+    )
+    .groupBy(licenseKeys.status);
+
+  for (const row of rows) {
+    counts[row.status] = row.count;
+    counts.total += row.count;
+  }
+  return counts;
+}
+
 export async function getLicenseKeyByKey(key: string) {
   const db = await getDb();
   if (!db) return null;
@@ -205,6 +442,16 @@ export async function getLicenseKeyByKey(key: string) {
   return result.length > 0 ? result[0] : null;
 }
 
+export async function getLicenseKeysByKeys(keys: string[]) {
+  const db = await getDb();
+  if (!db || keys.length === 0) return [];
+
+  return await db
+    .select()
+    .from(licenseKeys)
+    .where(inArray(licenseKeys.key, keys));
+}
+
 export async function getLicenseKeysByProductId(productId: number) {
   const db = await getDb();
   if (!db) return [];
@@ -215,14 +462,59 @@ export async function getLicenseKeysByProductId(productId: number) {
     .where(eq(licenseKeys.productId, productId));
 }
 
-export async function getLicenseKeysByBuyerId(buyerId: number) {
+export async function getLicenseKeysByBuyerId(
+  buyerId: number,
+  page: PageParams = {}
+): Promise<Page<LicenseKey>> {
   const db = await getDb();
-  if (!db) return [];
+  if (!db) return { items: [], nextCursor: null };
 
-  return await db
+  const limit = pageLimit(page);
+  const rows = await db
     .select()
     .from(licenseKeys)
-    .where(eq(licenseKeys.buyerId, buyerId));
+    .where(
+      and(
+        eq(licenseKeys.buyerId, buyerId),
+        afterCursor(licenseKeys.createdAt, licenseKeys.id, page.cursor)
+      )
+    )
+    .orderBy(desc(licenseKeys.createdAt), desc(licenseKeys.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
+}
+
+export async function getLicenseKeysBySellerId(
+  sellerId: number,
+  page: PageParams & { productId?: number } = {}
+): Promise<Page<LicenseKey>> {
+  const db = await getDb();
+  if (!db) return { items: [], nextCursor: null };
+
+  // 판매자 제품 목록을 먼저 읽지 않고 서브쿼리로 필터링
+  const sellerProductIds = db
+    .select({ id: products.id })
+    .from(products)
+    .where(eq(products.sellerId, sellerId));
+
+  const limit = pageLimit(page);
+  const rows = await db
+    .select()
+    .from(licenseKeys)
+    .where(
+      and(
+        inArray(licenseKeys.productId, sellerProductIds),
+        page.productId !== undefined
+          ? eq(licenseKeys.productId, page.productId)
+          : undefined,
+        afterCursor(licenseKeys.createdAt, licenseKeys.id, page.cursor)
+      )
+    )
+    .orderBy(desc(licenseKeys.createdAt), desc(licenseKeys.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
 }
 
 // Order queries
@@ -230,7 +522,8 @@ export async function createOrder(order: InsertOrder) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
 
-  return await db.insert(orders).values(order);
+  const [created] = await db.insert(orders).values(order).returning();
+  return created;
 }
 
 export async function getOrderById(orderId: number) {
@@ -246,26 +539,50 @@ export async function getOrderById(orderId: number) {
   return result.length > 0 ? result[0] : null;
 }
 
-export async function getOrdersByBuyerId(buyerId: number) {
+export async function getOrdersByBuyerId(
+  buyerId: number,
+  page: PageParams = {}
+): Promise<Page<Order>> {
   const db = await getDb();
-  if (!db) return [];
+  if (!db) return { items: [], nextCursor: null };
 
-  return await db
+  const limit = pageLimit(page);
+  const rows = await db
     .select()
     .from(orders)
-    .where(eq(orders.buyerId, buyerId))
-    .orderBy(desc(orders.createdAt));
+    .where(
+      and(
+        eq(orders.buyerId, buyerId),
+        afterCursor(orders.createdAt, orders.id, page.cursor)
+      )
+    )
+    .orderBy(desc(orders.createdAt), desc(orders.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
 }
 
-export async function getOrdersBySellerId(sellerId: number) {
+export async function getOrdersBySellerId(
+  sellerId: number,
+  page: PageParams = {}
+): Promise<Page<Order>> {
   const db = await getDb();
-  if (!db) return [];
+  if (!db) return { items: [], nextCursor: null };
 
-  return await db
+  const limit = pageLimit(page);
+  const rows = await db
     .select()
     .from(orders)
-    .where(eq(orders.sellerId, sellerId))
-    .orderBy(desc(orders.createdAt));
+    .where(
+      and(
+        eq(orders.sellerId, sellerId),
+        afterCursor(orders.createdAt, orders.id, page.cursor)
+      )
+    )
+    .orderBy(desc(orders.createdAt), desc(orders.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
 }
 
 export async function updateOrderStatus(
@@ -282,6 +599,36 @@ export async function updateOrderStatus(
 }
 
 // Download queries
+/**
+ * Whether the user paid for the product: a completed order confirmed by the
+ * payment flow (has a transactionId) or an active license key they own, both
+ * checked through the buyer indexes in one statement.
+ */
+export async function hasPurchasedProduct(
+  executor: DbExecutor,
+  userId: number,
+  productId: number
+) {
+  const [row] = await executor.execute<{ purchased: boolean }>(sql`
+    SELECT (
+      EXISTS (
+        SELECT 1 FROM ${orders}
+        WHERE ${orders.buyerId} = ${userId}
+          AND ${orders.productId} = ${productId}
+          AND ${orders.status} = 'completed'
+          AND ${orders.transactionId} IS NOT NULL
+      )
+      OR EXISTS (
+        SELECT 1 FROM ${licenseKeys}
+        WHERE ${licenseKeys.buyerId} = ${userId}
+          AND ${licenseKeys.productId} = ${productId}
+          AND ${licenseKeys.status} = 'active'
+      )
+    ) AS "purchased"
+  `);
+  return row?.purchased === true;
+}
+
 export async function recordDownload(download: InsertDownload) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
@@ -289,6 +636,18 @@ export async function recordDownload(download: InsertDownload) {
   return await db.insert(downloads).values(download);
 }
 
+/**
+ * Inserts download events with multi-row INSERTs (used by the download event queue).
+ */
+export async function insertDownloadsBulk(rows: InsertDownload[], chunkSize = 1000) {
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+
+  for (let i = 0; i < rows.length; i += chunkSize) {
+    await db.insert(downloads).values(rows.slice(i, i + chunkSize));
+  }
+}
+
 export async function getDownloadsByProductId(productId: number) {
   const db = await getDb();
   if (!db) return [];
@@ -334,23 +693,107 @@ export async function updateSellerProfile(
 }
 
 // Review functions
+const STAR_COLUMNS = ["stars1", "stars2", "stars3", "stars4", "stars5"] as const;
+
+/**
+ * Applies a review change to the product's rating aggregate with a single
+ * upsert. `added`/`removed` are the ratings entering/leaving the aggregate.
+ */
+async function adjustProductRating(
+  executor: DbExecutor,
+  productId: number,
+  change: { added?: number; removed?: number }
+) {
+  const delta = {
+    ratingCount: 0,
+    ratingSum: 0,
+    stars1: 0,
+    stars2: 0,
+    stars3: 0,
+    stars4: 0,
+    stars5: 0,
+  };
+  if (change.added !== undefined) {
+    delta.ratingCount += 1;
+    delta.ratingSum += change.added;
+    delta[STAR_COLUMNS[change.added - 1]] += 1;
+  }
+  if (change.removed !== undefined) {
+    delta.ratingCount -= 1;
+    delta.ratingSum -= change.removed;
+    delta[STAR_COLUMNS[change.removed - 1]] -= 1;
+  }
+
+  const increment = (column: keyof typeof delta) =>
+    sql`${productRatings[column]} + excluded.${sql.identifier(column)}`;
+
+  await executor
+    .insert(productRatings)
+    .values({ productId, ...delta })
+    .onConflictDoUpdate({
+      target: productRatings.productId,
+      set: {
+        ratingCount: increment("ratingCount"),
+        ratingSum: increment("ratingSum"),
+        stars1: increment("stars1"),
+        stars2: increment("stars2"),
+        stars3: increment("stars3"),
+        stars4: increment("stars4"),
+        stars5: increment("stars5"),
+        updatedAt: new Date(),
+      },
+    });
+}
+
 export async function createReview(review: InsertReview) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
 
-  const result = await db.insert(reviews).values(review);
-  return result;
+  return await db.transaction(async (tx) => {
+    const [created] = await tx.insert(reviews).values(review).returning();
+    await adjustProductRating(tx, created.productId, { added: created.rating });
+    return created;
+  });
 }
 
-export async function getReviewsByProductId(productId: number) {
+export async function getReviewsByProductId(
+  productId: number,
+  page: PageParams & { sort?: "newest" | "helpful" } = {}
+): Promise<Page<Review>> {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
 
-  return await db
+  const limit = pageLimit(page);
+
+  if (page.sort === "helpful") {
+    const rows = await db
+      .select()
+      .from(reviews)
+      .where(
+        and(
+          eq(reviews.productId, productId),
+          afterKeyset(reviews.helpful, reviews.id, page.cursor)
+        )
+      )
+      .orderBy(desc(reviews.helpful), desc(reviews.id))
+      .limit(limit + 1);
+
+    return toKeysetPage(rows, limit, row => row.helpful);
+  }
+
+  const rows = await db
     .select()
     .from(reviews)
-    .where(eq(reviews.productId, productId))
-    .orderBy(desc(reviews.createdAt));
+    .where(
+      and(
+        eq(reviews.productId, productId),
+        afterCursor(reviews.createdAt, reviews.id, page.cursor)
+      )
+    )
+    .orderBy(desc(reviews.createdAt), desc(reviews.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
 }
 
 export async function getReviewById(reviewId: number) {
@@ -373,17 +816,45 @@ export async function updateReview(
   const db = await getDb();
   if (!db) throw new Error("Database not available");
 
-  return await db
-    .update(reviews)
-    .set(updates)
-    .where(eq(reviews.id, reviewId));
+  return await db.transaction(async (tx) => {
+    // Lock the row so concurrent edits see each other's rating.
+    const [previous] = await tx
+      .select()
+      .from(reviews)
+      .where(eq(reviews.id, reviewId))
+      .for("update");
+    if (!previous) return null;
+
+    const [updated] = await tx
+      .update(reviews)
+      .set({ ...updates, updatedAt: new Date() })
+      .where(eq(reviews.id, reviewId))
+      .returning();
+
+    if (updated.rating !== previous.rating) {
+      await adjustProductRating(tx, updated.productId, {
+        added: updated.rating,
+        removed: previous.rating,
+      });
+    }
+    return updated;
+  });
 }
 
 export async function deleteReview(reviewId: number) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
 
-  return await db.delete(reviews).where(eq(reviews.id, reviewId));
+  return await db.transaction(async (tx) => {
+    const [deleted] = await tx
+      .delete(reviews)
+      .where(eq(reviews.id, reviewId))
+      .returning();
+    if (!deleted) return null;
+
+    await adjustProductRating(tx, deleted.productId, { removed: deleted.rating });
+    return deleted;
+  });
 }
 
 export async function getAverageRating(productId: number) {
@@ -391,12 +862,48 @@ export async function getAverageRating(productId: number) {
   if (!db) throw new Error("Database not available");
 
   const result = await db
-    .select({
-      avgRating: sql`AVG(${reviews.rating})`,
-      count: sql`COUNT(*)`,
-    })
-    .from(reviews)
-    .where(eq(reviews.productId, productId));
+    .select(productRatingColumns)
+    .from(productRatings)
+    .where(eq(productRatings.productId, productId))
+    .limit(1);
+
+  const summary = toRatingSummary(result[0] ?? null);
+  return {
+    avgRating: summary.average,
+    count: summary.count,
+    histogram: summary.histogram,
+  };
+}
 
-  return result[0];
+/**
+ * Rebuilds every product's rating aggregate from the reviews table,
+ * repairing any drift from the incremental updates.
+ */
+export async function reconcileProductRatings() {
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+
+  return await db.transaction(async (tx) => {
+    await tx.delete(productRatings);
+
+    const result = await tx.execute(sql`
+      INSERT INTO ${productRatings} (
+        "productId", "ratingCount", "ratingSum",
+        "stars1", "stars2", "stars3", "stars4", "stars5"
+      )
+      SELECT
+        ${reviews.productId},
+        COUNT(*),
+        SUM(${reviews.rating}),
+        COUNT(*) FILTER (WHERE ${reviews.rating} = 1),
+        COUNT(*) FILTER (WHERE ${reviews.rating} = 2),
+        COUNT(*) FILTER (WHERE ${reviews.rating} = 3),
+        COUNT(*) FILTER (WHERE ${reviews.rating} = 4),
+        COUNT(*) FILTER (WHERE ${reviews.rating} = 5)
+      FROM ${reviews}
+      GROUP BY ${reviews.productId}
+    `);
+
+    return { products: result.count ?? 0 };
+  });
 }
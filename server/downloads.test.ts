@@ -0,0 +1,91 @@
+import { describe, it, expect, vi, afterEach } from "vitest";
+import { WriteBehindQueue } from "./downloads";
+import { getSignedUrlExpiry } from "./storage";
+
+function createQueue(write = vi.fn(async (_rows: number[]) => {})) {
+  const queue = new WriteBehindQueue<number>({
+    batchSize: 3,
+    flushIntervalMs: 1000,
+    maxSize: 5,
+    write,
+  });
+  return { queue, write };
+}
+
+describe("WriteBehindQueue", () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("should flush when a batch fills up", async () => {
+    const { queue, write } = createQueue();
+
+    [1, 2, 3].forEach(row => queue.enqueue(row));
+    await queue.flush();
+
+    expect(write).toHaveBeenCalledWith([1, 2, 3]);
+    expect(queue.stats()).toMatchObject({ queued: 0, written: 3 });
+  });
+
+  it("should flush a partial batch after the interval", async () => {
+    vi.useFakeTimers();
+    const { queue, write } = createQueue();
+
+    queue.enqueue(1);
+    expect(write).not.toHaveBeenCalled();
+
+    await vi.advanceTimersByTimeAsync(1000);
+    expect(write).toHaveBeenCalledWith([1]);
+  });
+
+  it("should keep failed rows for the next flush", async () => {
+    const write = vi
+      .fn(async (_rows: number[]) => {})
+      .mockRejectedValueOnce(new Error("db down"));
+    const { queue } = createQueue(write);
+
+    queue.enqueue(1);
+    await queue.flush();
+    expect(queue.stats()).toMatchObject({ queued: 1, failures: 1 });
+
+    queue.enqueue(2);
+    await queue.drain();
+    expect(write).toHaveBeenLastCalledWith([1, 2]);
+    expect(queue.stats()).toMatchObject({ queued: 0, written: 2 });
+  });
+
+  it("should drop the oldest rows beyond maxSize", async () => {
+    vi.useFakeTimers();
+    const write = vi.fn(async (_rows: number[]) => {});
+    const queue = new WriteBehindQueue<number>({
+      batchSize: 100,
+      flushIntervalMs: 1000,
+      maxSize: 5,
+      write,
+    });
+
+    [1, 2, 3, 4, 5, 6].forEach(row => queue.enqueue(row));
+    expect(queue.stats()).toMatchObject({ queued: 5, dropped: 1 });
+
+    await queue.drain();
+    expect(write).toHaveBeenCalledWith([2, 3, 4, 5, 6]);
+  });
+});
+
+describe("getSignedUrlExpiry", () => {
+  it("should read S3 V4 presigned URL expiry", () => {
+    const url =
+      "https://bucket.s3.amazonaws.com/a.zip?X-Amz-Date=20250101T000000Z&X-Amz-Expires=3600&X-Amz-Signature=abc";
+    expect(getSignedUrlExpiry(url)).toBe(Date.UTC(2025, 0, 1, 1, 0, 0));
+  });
+
+  it("should read an epoch-seconds Expires parameter", () => {
+    expect(getSignedUrlExpiry("https://cdn.example.com/a.zip?Expires=1735693200")).toBe(
+      1735693200 * 1000
+    );
+  });
+
+  it("should return null for unsigned URLs", () => {
+    expect(getSignedUrlExpiry("https://example.com/a.zip")).toBeNull();
+  });
+});
@@ -0,0 +1,302 @@
+import { TRPCError } from "@trpc/server";
+import { and, eq, lt, sql } from "drizzle-orm";
+import { downloadCounts, licenseKeys, type InsertDownload } from "../drizzle/schema";
+import { getCatalogProduct } from "./catalog";
+import { getDb, hasPurchasedProduct, insertDownloadsBulk, type DbExecutor } from "./db";
+import { invalidateLicenseKey } from "./license";
+import { storageGet } from "./storage";
+
+/**
+ * 다운로드 기록 서비스
+ *
+ * 릴리스 직후 다운로드가 몰려도 요청 경로에서 downloads 행을 하나씩 INSERT하지 않도록
+ * 다운로드 이벤트를 메모리 큐에 모아 multi-row INSERT로 기록합니다. (write-behind)
+ * - DOWNLOAD_BATCH_SIZE개가 쌓이거나 DOWNLOAD_FLUSH_INTERVAL_MS가 지나면 flush
+ * - 서버 종료 시 drainDownloadQueue로 남은 이벤트 기록
+ * - 기록 실패 시 큐 앞쪽에 되돌려 다음 flush에서 재시도 (DOWNLOAD_QUEUE_MAX_SIZE 초과분은 버림)
+ *
+ * 권한과 제한은 이벤트 기록과 분리해 요청 안에서 판단하며, 각 확인은 한 문장으로 실행합니다.
+ * - 구매 확인: 결제 승인된 주문(transactionId 있음) 또는 본인 소유의 활성 라이선스 (판매자 본인은 제외)
+ *   비활성화된 제품도 이미 구매한 사용자는 다운로드할 수 있습니다.
+ * - products.maxDownloads: download_counts 조건부 upsert (count < max일 때만 증가)
+ * - licenseKeys.maxActivations: 라이선스 키를 제시한 다운로드 한 번을 활성화 한 번으로 계산
+ *   (본인 소유의 활성 키이고 activationCount < maxActivations일 때만 증가하는 UPDATE, 구매 확인도 겸함)
+ * 카운터 두 개(활성화 + 다운로드 횟수)를 함께 써야 할 때만 트랜잭션을 엽니다.
+ * downloads 테이블은 이력/통계용이며, 프로세스가 비정상 종료되면 flush 전 이벤트는 유실될 수 있습니다.
+ */
+
+const DOWNLOAD_BATCH_SIZE = 500;
+const DOWNLOAD_FLUSH_INTERVAL_MS = 1000;
+const DOWNLOAD_QUEUE_MAX_SIZE = 100_000;
+
+export type WriteBehindQueueOptions<T> = {
+  batchSize: number;
+  flushIntervalMs: number;
+  maxSize: number;
+  write: (rows: T[]) => Promise<void>;
+};
+
+/**
+ * 크기/시간 기준으로 flush하는 write-behind 큐
+ */
+export class WriteBehindQueue<T> {
+  private buffer: T[] = [];
+  private timer: NodeJS.Timeout | null = null;
+  private flushing: Promise<void> | null = null;
+  private written = 0;
+  private dropped = 0;
+  private failures = 0;
+
+  constructor(private readonly options: WriteBehindQueueOptions<T>) {}
+
+  enqueue(row: T): void {
+    this.buffer.push(row);
+    this.trim();
+
+    if (this.buffer.length >= this.options.batchSize) {
+      void this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        void this.flush();
+      }, this.options.flushIntervalMs);
+      this.timer.unref();
+    }
+  }
+
+  /**
+   * 쌓인 이벤트를 기록합니다. 진행 중인 flush가 있으면 그 flush가 끝난 뒤 이어서 기록합니다.
+   */
+  async flush(): Promise<void> {
+    while (this.flushing) {
+      await this.flushing;
+    }
+    if (this.buffer.length === 0) return;
+
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    const rows = this.buffer;
+    this.buffer = [];
+
+    this.flushing = this.options
+      .write(rows)
+      .then(() => {
+        this.written += rows.length;
+      })
+      .catch(error => {
+        console.error(`[Write Behind] Failed to write ${rows.length} rows:`, error);
+        this.failures++;
+        // 실패한 행을 앞쪽에 되돌리고 다음 주기에 재시도
+        this.buffer = rows.concat(this.buffer);
+        this.trim();
+        if (!this.timer) {
+          this.timer = setTimeout(() => {
+            this.timer = null;
+            void this.flush();
+          }, this.options.flushIntervalMs);
+          this.timer.unref();
+        }
+      })
+      .finally(() => {
+        this.flushing = null;
+      });
+
+    await this.flushing;
+  }
+
+  /**
+   * 남은 이벤트를 모두 기록합니다. (종료 시 호출, 한 번 더 실패하면 포기)
+   */
+  async drain(): Promise<void> {
+    await this.flush();
+    if (this.buffer.length > 0) {
+      await this.flush();
+    }
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+  }
+
+  private trim() {
+    const overflow = this.buffer.length - this.options.maxSize;
+    if (overflow > 0) {
+      this.buffer.splice(0, overflow);
+      this.dropped += overflow;
+    }
+  }
+
+  stats() {
+    return {
+      queued: this.buffer.length,
+      written: this.written,
+      dropped: this.dropped,
+      failures: this.failures,
+    };
+  }
+}
+
+const downloadQueue = new WriteBehindQueue<InsertDownload>({
+  batchSize: DOWNLOAD_BATCH_SIZE,
+  flushIntervalMs: DOWNLOAD_FLUSH_INTERVAL_MS,
+  maxSize: DOWNLOAD_QUEUE_MAX_SIZE,
+  write: rows => insertDownloadsBulk(rows, DOWNLOAD_BATCH_SIZE),
+});
+
+export type DownloadRequest = {
+  userId: number;
+  productId: number;
+  licenseKeyId?: number;
+  ipAddress?: string | null;
+  userAgent?: string | null;
+};
+
+/**
+ * 라이선스 키 활성화 횟수를 하나 늘립니다. 본인 소유의 활성 키가 아니거나 한도에 도달하면 거부합니다.
+ */
+async function activateLicense(
+  executor: DbExecutor,
+  request: DownloadRequest,
+  licenseKeyId: number
+): Promise<string> {
+  const owned = and(
+    eq(licenseKeys.id, licenseKeyId),
+    eq(licenseKeys.buyerId, request.userId),
+    eq(licenseKeys.productId, request.productId),
+    eq(licenseKeys.status, "active")
+  );
+
+  const [activated] = await executor
+    .update(licenseKeys)
+    .set({
+      activationCount: sql`${licenseKeys.activationCount} + 1`,
+      activatedAt: sql`COALESCE(${licenseKeys.activatedAt}, now())`,
+      updatedAt: new Date(),
+    })
+    .where(and(owned, lt(licenseKeys.activationCount, licenseKeys.maxActivations)))
+    .returning({ key: licenseKeys.key });
+
+  if (activated) return activated.key;
+
+  // 거부 사유 구분 (실패한 경우에만 조회)
+  const [license] = await executor
+    .select({ id: licenseKeys.id })
+    .from(licenseKeys)
+    .where(owned)
+    .limit(1);
+
+  throw new TRPCError({
+    code: "FORBIDDEN",
+    message: license ? "Activation limit reached" : "License is not valid",
+  });
+}
+
+/**
+ * 사용자별 다운로드 횟수를 하나 늘립니다. maxDownloads에 도달하면 거부합니다.
+ */
+async function countDownload(
+  executor: DbExecutor,
+  request: DownloadRequest,
+  maxDownloads: number
+) {
+  const counted =
+    maxDownloads > 0
+      ? await executor
+          .insert(downloadCounts)
+          .values({ userId: request.userId, productId: request.productId, count: 1 })
+          .onConflictDoUpdate({
+            target: [downloadCounts.userId, downloadCounts.productId],
+            set: {
+              count: sql`${downloadCounts.count} + 1`,
+              updatedAt: new Date(),
+            },
+            setWhere: lt(downloadCounts.count, maxDownloads),
+          })
+          .returning({ count: downloadCounts.count })
+      : [];
+
+  if (counted.length === 0) {
+    throw new TRPCError({ code: "FORBIDDEN", message: "Download limit reached" });
+  }
+}
+
+/**
+ * 구매 여부와 다운로드/라이선스 활성화 한도를 확인하고 이벤트를 큐에 넣습니다.
+ * 서명된 다운로드 URL은 모든 확인을 통과한 뒤에만 발급합니다.
+ */
+export async function recordDownloadEvent(request: DownloadRequest) {
+  const product = await getCatalogProduct(request.productId);
+  if (!product) {
+    throw new TRPCError({ code: "NOT_FOUND", message: "Product not found" });
+  }
+
+  const { maxDownloads } = product;
+  const { licenseKeyId } = request;
+
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+
+  let activatedKey: string | null = null;
+
+  if (licenseKeyId === undefined) {
+    if (
+      product.sellerId !== request.userId &&
+      !(await hasPurchasedProduct(db, request.userId, request.productId))
+    ) {
+      throw new TRPCError({ code: "FORBIDDEN", message: "Product not purchased" });
+    }
+    if (maxDownloads !== null) {
+      await countDownload(db, request, maxDownloads);
+    }
+  } else if (maxDownloads === null) {
+    activatedKey = await activateLicense(db, request, licenseKeyId);
+  } else {
+    // 다운로드 한도에 걸리면 활성화도 되돌림
+    activatedKey = await db.transaction(async (tx) => {
+      const key = await activateLicense(tx, request, licenseKeyId);
+      await countDownload(tx, request, maxDownloads);
+      return key;
+    });
+  }
+
+  if (activatedKey) {
+    invalidateLicenseKey(activatedKey);
+  }
+
+  downloadQueue.enqueue({
+    userId: request.userId,
+    productId: request.productId,
+    licenseKeyId,
+    ipAddress: request.ipAddress ?? null,
+    userAgent: request.userAgent ?? null,
+    downloadedAt: new Date(),
+  });
+
+  return {
+    success: true,
+    downloadUrl: await resolveDownloadUrl(product.downloadUrl),
+  } as const;
+}
+
+/**
+ * products.downloadUrl이 절대 URL이면 그대로, 저장소 키면 서명된 URL(캐시)로 변환합니다.
+ */
+async function resolveDownloadUrl(downloadUrl: string | null): Promise<string | null> {
+  if (!downloadUrl) return null;
+  if (/^https?:\/\//i.test(downloadUrl)) return downloadUrl;
+  return (await storageGet(downloadUrl)).url;
+}
+
+/**
+ * 종료 시 큐에 남은 다운로드 이벤트를 기록합니다.
+ */
+export async function drainDownloadQueue() {
+  await downloadQueue.drain();
+}
+
+export function getDownloadQueueStats() {
+  return downloadQueue.stats();
+}
@@ -0,0 +1,212 @@
+import { TRPCError } from "@trpc/server";
+import { once } from "events";
+import type { Express, Request, Response } from "express";
+import { nanoid } from "nanoid";
+import { TtlCache } from "./_core/cache";
+import { authenticateClerkRequest } from "./_core/clerk-auth";
+import {
+  getProductById,
+  insertLicenseKeysBulk,
+  streamLicenseKeysByProductId,
+  type LicenseKeyExportRow,
+} from "./db";
+
+/**
+ * 대량 라이선스 키 생성 및 CSV 내보내기
+ *
+ * - 소량 생성: 요청 안에서 청크 단위 multi-row INSERT ... RETURNING
+ * - 대량 생성: 백그라운드 작업으로 실행하고 클라이언트는 진행률을 폴링 (판매자당 동시에 1개)
+ * - 내보내기: DB 커서로 배치 단위 조회 후 CSV로 스트리밍
+ */
+
+export const MAX_SYNC_GENERATE_COUNT = 1000;
+export const MAX_BULK_GENERATE_COUNT = 100_000;
+
+const GENERATE_CHUNK_SIZE = 1000;
+const JOB_RETENTION_MS = 24 * 60 * 60 * 1000;
+
+export type LicenseGenerationJob = {
+  id: string;
+  productId: number;
+  sellerId: number;
+  status: "running" | "completed" | "failed";
+  requested: number;
+  generated: number;
+  error?: string;
+  createdAt: Date;
+  finishedAt?: Date;
+};
+
+// 실행 중인 작업은 LRU에서 밀려나지 않도록 판매자별로 따로 보관하고,
+// 끝난 작업만 JOB_RETENTION_MS 동안 조회용 캐시에 남깁니다.
+const runningJobs = new Map<number, LicenseGenerationJob>();
+const finishedJobs = new TtlCache<string, LicenseGenerationJob>({
+  maxSize: 1000,
+  ttlMs: JOB_RETENTION_MS,
+});
+
+function buildLicenseKeyRows(productId: number, count: number) {
+  return Array.from({ length: count }, () => ({
+    productId,
+    key: `${productId}-${nanoid(20)}`,
+    status: "inactive" as const,
+  }));
+}
+
+/**
+ * 요청 안에서 바로 라이선스 키를 생성합니다.
+ */
+export async function generateLicenseKeys(productId: number, count: number) {
+  return await insertLicenseKeysBulk(
+    buildLicenseKeyRows(productId, count),
+    GENERATE_CHUNK_SIZE
+  );
+}
+
+async function runGenerationJob(job: LicenseGenerationJob) {
+  try {
+    while (job.generated < job.requested) {
+      const size = Math.min(GENERATE_CHUNK_SIZE, job.requested - job.generated);
+      const inserted = await insertLicenseKeysBulk(
+        buildLicenseKeyRows(job.productId, size),
+        GENERATE_CHUNK_SIZE
+      );
+      job.generated += inserted.length;
+    }
+    job.status = "completed";
+  } catch (error) {
+    console.error(`[License Bulk] Job ${job.id} failed:`, error);
+    job.status = "failed";
+    job.error = error instanceof Error ? error.message : String(error);
+  } finally {
+    job.finishedAt = new Date();
+    runningJobs.delete(job.sellerId);
+    finishedJobs.set(job.id, job);
+  }
+}
+
+/**
+ * 대량 생성 작업을 시작하고 즉시 작업 정보를 반환합니다.
+ * 같은 판매자의 작업이 이미 실행 중이면 CONFLICT로 거부합니다.
+ */
+export function startLicenseGenerationJob(
+  productId: number,
+  sellerId: number,
+  count: number
+): LicenseGenerationJob {
+  const running = runningJobs.get(sellerId);
+  if (running) {
+    throw new TRPCError({
+      code: "CONFLICT",
+      message: `License generation job ${running.id} is still running`,
+    });
+  }
+
+  const job: LicenseGenerationJob = {
+    id: nanoid(),
+    productId,
+    sellerId,
+    status: "running",
+    requested: count,
+    generated: 0,
+    createdAt: new Date(),
+  };
+  runningJobs.set(sellerId, job);
+  void runGenerationJob(job);
+  return job;
+}
+
+/**
+ * 작업 진행 상태 조회 (요청한 판매자의 작업만 반환)
+ */
+export function getLicenseGenerationJob(
+  jobId: string,
+  sellerId: number
+): LicenseGenerationJob | null {
+  const running = runningJobs.get(sellerId);
+  if (running?.id === jobId) return running;
+
+  const job = finishedJobs.get(jobId);
+  if (!job || job.sellerId !== sellerId) return null;
+  return job;
+}
+
+const CSV_HEADER = "id,key,status,buyerId,orderId,activatedAt,expiresAt,createdAt\n";
+
+function toCsvValue(value: string | number | Date | null): string {
+  if (value === null) return "";
+  if (value instanceof Date) return value.toISOString();
+  const text = String(value);
+  return /[",\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+function toCsvLine(row: LicenseKeyExportRow): string {
+  return [
+    row.id,
+    row.key,
+    row.status,
+    row.buyerId,
+    row.orderId,
+    row.activatedAt,
+    row.expiresAt,
+    row.createdAt,
+  ]
+    .map(toCsvValue)
+    .join(",");
+}
+
+/**
+ * 라이선스 키 CSV 내보내기 라우트 등록
+ *
+ * GET /api/licenses/:productId/export.csv (Authorization: Bearer <Clerk 토큰>)
+ */
+export function registerLicenseExportRoutes(app: Express) {
+  app.get(
+    "/api/licenses/:productId/export.csv",
+    async (req: Request, res: Response) => {
+      // Express 4는 async 핸들러의 rejection을 처리하지 않으므로 전체를 감쌈
+      try {
+        const productId = parseInt(req.params.productId);
+        if (!productId) {
+          res.status(400).json({ message: "Invalid product id" });
+          return;
+        }
+
+        const user = await authenticateClerkRequest(req);
+        if (!user) {
+          res.status(401).json({ message: "Unauthorized" });
+          return;
+        }
+
+        const product = await getProductById(productId);
+        if (!product || product.sellerId !== user.id) {
+          res.status(403).json({ message: "Forbidden" });
+          return;
+        }
+
+        res.setHeader("Content-Type", "text/csv; charset=utf-8");
+        res.setHeader(
+          "Content-Disposition",
+          `attachment; filename="licenses-${productId}.csv"`
+        );
+        res.write(CSV_HEADER);
+
+        for await (const rows of streamLicenseKeysByProductId(productId)) {
+          if (res.destroyed) break;
+          const chunk = rows.map(toCsvLine).join("\n") + "\n";
+          if (!res.write(chunk)) {
+            await Promise.race([once(res, "drain"), once(res, "close")]);
+          }
+        }
+        res.end();
+      } catch (error) {
+        console.error("[License Export] Failed:", error);
+        if (!res.headersSent) {
+          res.status(500).json({ message: "Export failed" });
+        } else {
+          res.destroy(error instanceof Error ? error : undefined);
+        }
+      }
+    }
+  );
+}
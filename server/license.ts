@@ -0,0 +1,119 @@
+import type { LicenseKey } from "../drizzle/schema";
+import { TtlCache } from "./_core/cache";
+import { getLicenseKeyByKey, getLicenseKeysByKeys } from "./db";
+
+/**
+ * 라이선스 키 검증 서비스
+ *
+ * 배포된 소프트웨어가 실행될 때마다 호출되는 검증 경로이므로
+ * 프로세스 내 캐시로 DB 조회를 줄입니다.
+ * - 존재하는 키: LICENSE_CACHE_TTL_MS 동안 캐시
+ * - 존재하지 않는 키: null로 negative caching (LICENSE_NEGATIVE_TTL_MS)
+ * - 상태 변경(licenses.updateStatus, 결제 승인) 시 invalidateLicenseKey로 즉시 제거
+ * - 만료 여부(expiresAt)는 캐시된 행으로 매 요청 판단하므로 DB 조회 없이 거부
+ */
+
+const LICENSE_CACHE_TTL_MS = 60 * 1000;
+const LICENSE_NEGATIVE_TTL_MS = 30 * 1000;
+const LICENSE_CACHE_MAX_SIZE = 50_000;
+
+export const MAX_BATCH_VALIDATE_KEYS = 500;
+
+export type LicenseValidationResult =
+  | { valid: true; message: string; license: LicenseKey }
+  | { valid: false; message: string; license?: LicenseKey };
+
+const licenseCache = new TtlCache<string, LicenseKey | null>({
+  maxSize: LICENSE_CACHE_MAX_SIZE,
+  ttlMs: LICENSE_CACHE_TTL_MS,
+});
+
+function cacheLicense(key: string, license: LicenseKey | null) {
+  licenseCache.set(
+    key,
+    license,
+    license ? LICENSE_CACHE_TTL_MS : LICENSE_NEGATIVE_TTL_MS
+  );
+}
+
+function toValidationResult(
+  license: LicenseKey | null,
+  now: Date = new Date()
+): LicenseValidationResult {
+  if (!license) {
+    return { valid: false, message: "Invalid license key" };
+  }
+  if (license.status !== "active") {
+    return { valid: false, message: "License is not active" };
+  }
+  if (license.expiresAt && license.expiresAt <= now) {
+    return { valid: false, message: "License has expired" };
+  }
+  return { valid: true, message: "License is valid", license };
+}
+
+/**
+ * 단일 라이선스 키 검증
+ */
+export async function validateLicenseKey(
+  key: string
+): Promise<LicenseValidationResult> {
+  let license = licenseCache.get(key);
+
+  if (license === undefined) {
+    license = await getLicenseKeyByKey(key);
+    cacheLicense(key, license);
+  }
+
+  return toValidationResult(license);
+}
+
+/**
+ * 여러 라이선스 키를 한 번에 검증
+ *
+ * 캐시에 없는 키만 모아 하나의 IN 쿼리(unique 인덱스 사용)로 조회합니다.
+ * 결과는 입력 순서를 유지합니다.
+ */
+export async function validateLicenseKeys(
+  keys: string[]
+): Promise<Array<LicenseValidationResult & { key: string }>> {
+  const resolved = new Map<string, LicenseKey | null>();
+  const missing: string[] = [];
+
+  for (const key of new Set(keys)) {
+    const cached = licenseCache.get(key);
+    if (cached === undefined) {
+      missing.push(key);
+    } else {
+      resolved.set(key, cached);
+    }
+  }
+
+  if (missing.length > 0) {
+    const rows = await getLicenseKeysByKeys(missing);
+    const byKey = new Map(rows.map(row => [row.key, row]));
+
+    for (const key of missing) {
+      const license = byKey.get(key) ?? null;
+      cacheLicense(key, license);
+      resolved.set(key, license);
+    }
+  }
+
+  const now = new Date();
+  return keys.map(key => ({
+    key,
+    ...toValidationResult(resolved.get(key) ?? null, now),
+  }));
+}
+
+/**
+ * 라이선스 키 상태가 바뀌었을 때 캐시에서 제거합니다.
+ */
+export function invalidateLicenseKey(key: string): void {
+  licenseCache.delete(key);
+}
+
+export function getLicenseCacheStats() {
+  return licenseCache.stats();
+}
@@ -0,0 +1,24 @@
+import { describe, it, expect } from "vitest";
+import { decodeCursor, encodeCursor, toPage } from "./pagination";
+
+describe("Keyset pagination", () => {
+  it("should round-trip a cursor", () => {
+    const position = { createdAt: new Date("2025-01-02T03:04:05.678Z"), id: 42 };
+    expect(decodeCursor(encodeCursor(position))).toEqual(position);
+  });
+
+  it("should reject a malformed cursor", () => {
+    expect(() => decodeCursor("not-a-cursor")).toThrow("Invalid cursor");
+  });
+
+  it("should return a next cursor only when more rows exist", () => {
+    const rows = [3, 2, 1].map(id => ({ id, createdAt: new Date(id * 1000) }));
+
+    const firstPage = toPage(rows, 2);
+    expect(firstPage.items.map(r => r.id)).toEqual([3, 2]);
+    expect(decodeCursor(firstPage.nextCursor!)).toEqual(rows[1]);
+
+    const lastPage = toPage(rows.slice(2), 2);
+    expect(lastPage.nextCursor).toBeNull();
+  });
+});
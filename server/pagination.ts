@@ -0,0 +1,127 @@
+import { TRPCError } from "@trpc/server";
+import { sql, type Column, type SQL } from "drizzle-orm";
+import { z } from "zod";
+
+/**
+ * Keyset (cursor) pagination on (createdAt, id).
+ *
+ * Lists are ordered by `createdAt DESC, id DESC` and the next page starts
+ * strictly after the last row returned, so each page is an index range scan
+ * on a composite `(..., createdAt, id)` index instead of an OFFSET scan.
+ * createdAt columns use millisecond precision so the cursor round-trips
+ * exactly through a JS Date.
+ *
+ * Lists ordered by another numeric column (e.g. reviews by `helpful`) use
+ * the `*Keyset` variants with `(value, id)` cursors.
+ */
+
+export const DEFAULT_PAGE_SIZE = 20;
+export const MAX_PAGE_SIZE = 100;
+
+export type PageParams = {
+  cursor?: string | null;
+  limit?: number;
+};
+
+export type Page<T> = {
+  items: T[];
+  nextCursor: string | null;
+};
+
+type CursorPosition = {
+  createdAt: Date;
+  id: number;
+};
+
+export const pageInput = z.object({
+  cursor: z.string().nullish(),
+  limit: z.number().min(1).max(MAX_PAGE_SIZE).optional(),
+});
+
+type KeysetPosition = {
+  value: number;
+  id: number;
+};
+
+function encodeKeyset(position: KeysetPosition): string {
+  return Buffer.from(`${position.value}:${position.id}`).toString("base64url");
+}
+
+function decodeKeyset(cursor: string): KeysetPosition {
+  const [value, id] = Buffer.from(cursor, "base64url").toString().split(":");
+  const position = { value: Number(value), id: Number(id) };
+
+  if (!Number.isFinite(position.value) || !Number.isInteger(position.id)) {
+    throw new TRPCError({ code: "BAD_REQUEST", message: "Invalid cursor" });
+  }
+
+  return position;
+}
+
+export function encodeCursor(row: CursorPosition): string {
+  return encodeKeyset({ value: row.createdAt.getTime(), id: row.id });
+}
+
+export function decodeCursor(cursor: string): CursorPosition {
+  const { value, id } = decodeKeyset(cursor);
+  return { createdAt: new Date(value), id };
+}
+
+export function pageLimit(page: PageParams): number {
+  return Math.min(page.limit ?? DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE);
+}
+
+/**
+ * WHERE condition selecting rows after the cursor in
+ * `createdAt DESC, id DESC` order, or undefined for the first page.
+ */
+export function afterCursor(
+  createdAtColumn: Column,
+  idColumn: Column,
+  cursor: string | null | undefined
+): SQL | undefined {
+  if (!cursor) return undefined;
+  const position = decodeCursor(cursor);
+  return sql`(${createdAtColumn}, ${idColumn}) < (${sql.param(
+    position.createdAt,
+    createdAtColumn
+  )}, ${position.id})`;
+}
+
+/**
+ * WHERE condition selecting rows after the cursor in
+ * `value DESC, id DESC` order for a numeric value column or expression.
+ */
+export function afterKeyset(
+  valueColumn: Column | SQL,
+  idColumn: Column,
+  cursor: string | null | undefined
+): SQL | undefined {
+  if (!cursor) return undefined;
+  const position = decodeKeyset(cursor);
+  return sql`(${valueColumn}, ${idColumn}) < (${position.value}, ${position.id})`;
+}
+
+/**
+ * Builds a page from rows fetched with `limit + 1`.
+ */
+export function toPage<T extends CursorPosition>(rows: T[], limit: number): Page<T> {
+  return toKeysetPage(rows, limit, row => row.createdAt.getTime());
+}
+
+/**
+ * Builds a page from rows fetched with `limit + 1`, keyed by `value(row)`.
+ */
+export function toKeysetPage<T extends { id: number }>(
+  rows: T[],
+  limit: number,
+  value: (row: T) => number
+): Page<T> {
+  if (rows.length <= limit) {
+    return { items: rows, nextCursor: null };
+  }
+
+  const items = rows.slice(0, limit);
+  const last = items[items.length - 1];
+  return { items, nextCursor: encodeKeyset({ value: value(last), id: last.id }) };
+}
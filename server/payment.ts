@@ -1,8 +1,13 @@
 import { z } from 'zod';
-import { getDb } from './db';
-import { orders, licenseKeys } from '../drizzle/schema';
-import { eq } from 'drizzle-orm';
+import http from 'http';
+import https from 'https';
+import axios from 'axios';
+import { getDb, type DbExecutor } from './db';
+import { orders, licenseKeys, products } from '../drizzle/schema';
+import { and, eq } from 'drizzle-orm';
 import { nanoid } from 'nanoid';
+import { invalidateLicenseKey } from './license';
+import { recordRefund, recordSale } from './rollups';
 
 /**
  * Toss Payments API 개별 연동 방식
@@ -22,7 +27,25 @@ import { nanoid } from 'nanoid';
 
 // 환경 변수에서 Toss Payments 시크릿 키 가져오기
 const TOSS_SECRET_KEY = process.env.TOSS_SECRET_KEY || '';
-const TOSS_API_URL = 'https://api.tosspayments.com/v1/payments';
+// 로컬 벤치마크에서는 mock 서버 주소로 교체 (server/bench/toss-mock.ts)
+const TOSS_API_URL = process.env.TOSS_API_URL || 'https://api.tosspayments.com/v1/payments';
+
+const TOSS_TIMEOUT_MS = 10_000;
+const TOSS_MAX_SOCKETS = 64;
+
+/**
+ * Toss Payments HTTP 클라이언트
+ *
+ * keep-alive 에이전트로 연결을 재사용하고, 응답이 없는 요청은 타임아웃으로 끊습니다.
+ * 상태 코드 판단은 호출하는 쪽에서 합니다.
+ */
+const tossClient = axios.create({
+  baseURL: TOSS_API_URL,
+  timeout: TOSS_TIMEOUT_MS,
+  httpAgent: new http.Agent({ keepAlive: true, maxSockets: TOSS_MAX_SOCKETS }),
+  httpsAgent: new https.Agent({ keepAlive: true, maxSockets: TOSS_MAX_SOCKETS }),
+  validateStatus: () => true,
+});
 
 /**
  * 시크릿 키를 Base64로 인코딩하여 Basic 인증 헤더 생성
@@ -34,37 +57,105 @@ export function getBasicAuthHeader(): string {
   return `Basic ${encoded}`;
 }
 
+/**
+ * Toss Payments API POST 요청
+ *
+ * Idempotency-Key를 지정하면 재시도된 요청에 Toss가 최초 응답을 그대로 돌려줍니다.
+ */
+async function postToToss(
+  path: string,
+  body: Record<string, unknown>,
+  idempotencyKey: string
+): Promise<{ ok: boolean; data: any }> {
+  const response = await tossClient.post(path, body, {
+    headers: {
+      'Authorization': getBasicAuthHeader(),
+      'Content-Type': 'application/json',
+      'Idempotency-Key': idempotencyKey,
+    },
+  });
+  return {
+    ok: response.status >= 200 && response.status < 300,
+    data: response.data,
+  };
+}
+
+/**
+ * 클라이언트 orderId 형식({orderId}-{timestamp})에서 주문 번호 추출
+ */
+function parseOrderId(orderId: string): number {
+  return parseInt(orderId.split('-')[0]) || 0;
+}
+
+async function findOrderLicenseKey(executor: DbExecutor, orderId: number) {
+  const license = await executor
+    .select({ key: licenseKeys.key })
+    .from(licenseKeys)
+    .where(eq(licenseKeys.orderId, orderId))
+    .limit(1);
+  return license[0]?.key ?? null;
+}
+
+export type PaymentApprovalResult = {
+  success: boolean;
+  paymentId?: string;
+  productName?: string;
+  licenseKey?: string | null;
+  /** 같은 paymentKey로 이미 승인된 주문에 대한 재요청 */
+  alreadyProcessed?: boolean;
+  error?: string;
+};
+
 /**
  * 2️⃣ 결제 승인 요청
  *
  * 클라이언트에서 받은 paymentKey, orderId, amount를 사용하여
  * Toss Payments API에 결제 승인을 요청합니다.
+ *
+ * - paymentKey 기준 멱등 처리: 이미 승인된 주문은 Toss 호출 없이 기존 결과를 반환
+ * - 주문 상태 변경, 라이선스 키 생성, 판매 집계는 주문 행을 잠근 하나의 트랜잭션에서 처리
  */
 export async function approvePayment(
   paymentKey: string,
   orderId: string,
   amount: number,
   userId: number
-): Promise<{
-  success: boolean;
-  paymentId?: string;
-  error?: string;
-}> {
+): Promise<PaymentApprovalResult> {
   try {
     console.log(`[결제 승인] 시작 - orderId: ${orderId}, amount: ${amount}`);
 
     const db = await getDb();
     if (!db) throw new Error('Database not available');
 
-    // 1. 금액 검증 (클라이언트에서 조작되지 않았는지 확인)
-    const orderIdNum = parseInt(orderId.split('-')[0]) || 0;
-    const orderList = await db.select().from(orders).where(eq(orders.id, orderIdNum)).limit(1);
-    const order = orderList[0];
+    // 1. 주문과 제품명을 한 번에 조회
+    const orderList = await db
+      .select({ order: orders, productName: products.title })
+      .from(orders)
+      .innerJoin(products, eq(products.id, orders.productId))
+      .where(eq(orders.id, parseOrderId(orderId)))
+      .limit(1);
 
-    if (!order) {
+    if (!orderList[0] || orderList[0].order.buyerId !== userId) {
       throw new Error('주문을 찾을 수 없습니다.');
     }
 
+    const { order, productName } = orderList[0];
+
+    // 재시도된 승인 요청은 DB 조회만으로 응답
+    if (order.status === 'completed' && order.transactionId === paymentKey) {
+      return {
+        success: true,
+        paymentId: paymentKey,
+        productName,
+        licenseKey: await findOrderLicenseKey(db, order.id),
+        alreadyProcessed: true,
+      };
+    }
+
+    if (order.status !== 'pending') {
+      throw new Error('이미 처리된 주문입니다.');
+    }
+
     // 금액이 일치하는지 확인 (보안) - totalPrice 사용
     const expectedAmount = Math.round(parseFloat(order.totalPrice));
     if (expectedAmount !== amount) {
@@ -72,59 +163,82 @@ export async function approvePayment(
     }
 
     // 2. Toss Payments API에 결제 승인 요청
-    const response = await fetch(`${TOSS_API_URL}/${paymentKey}`, {
-      method: 'POST',
-      headers: {
-        'Authorization': getBasicAuthHeader(),
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({
-        orderId: orderId,
-        amount: amount,
-      }),
-    });
+    const response = await postToToss(
+      `/${paymentKey}`,
+      { orderId: orderId, amount: amount },
+      paymentKey
+    );
 
     if (!response.ok) {
-      const errorData = await response.json();
-      console.error('[결제 승인 실패]', errorData);
-      throw new Error(errorData.message || '결제 승인에 실패했습니다.');
+      console.error('[결제 승인 실패]', response.data);
+      throw new Error(response.data?.message || '결제 승인에 실패했습니다.');
     }
 
-    const paymentData = await response.json();
-
     console.log(`[결제 승인 성공] paymentKey: ${paymentKey}`);
 
-    // 3. 결제 성공 후 처리
+    // 3. 결제 성공 후 처리 (주문 행을 잠근 하나의 트랜잭션)
     // - 주문 상태 업데이트
     // - 라이선스 키 생성
+    // - 판매 집계 반영
+    const result = await db.transaction(async (tx) => {
+      const [locked] = await tx
+        .select()
+        .from(orders)
+        .where(eq(orders.id, order.id))
+        .for('update');
 
-    // 주문 상태를 'completed'로 업데이트
-    await db
-      .update(orders)
-      .set({
-        status: 'completed',
-        transactionId: paymentKey,
-        updatedAt: new Date(),
-      })
-      .where(eq(orders.id, order.id));
-
-    // 라이선스 키 생성
-    const licenseKey = generateLicenseKey();
-    await db.insert(licenseKeys).values({
-      key: licenseKey,
-      productId: order.productId,
-      buyerId: userId,
-      orderId: order.id,
-      status: 'active',
-      activatedAt: new Date(),
-      expiresAt: new Date(Date.now() + 365 * 24 * 60 * 60 * 1000), // 1년 유효
+      // 동시에 들어온 같은 승인 요청이 먼저 처리한 경우
+      if (locked.status === 'completed' && locked.transactionId === paymentKey) {
+        return {
+          licenseKey: await findOrderLicenseKey(tx, order.id),
+          alreadyProcessed: true,
+        };
+      }
+      if (locked.status !== 'pending') {
+        throw new Error('이미 처리된 주문입니다.');
+      }
+
+      // 주문 상태를 'completed'로 업데이트
+      const [completedOrder] = await tx
+        .update(orders)
+        .set({
+          status: 'completed',
+          transactionId: paymentKey,
+          updatedAt: new Date(),
+        })
+        .where(eq(orders.id, order.id))
+        .returning();
+
+      // 라이선스 키 생성
+      const [license] = await tx
+        .insert(licenseKeys)
+        .values({
+          key: generateLicenseKey(),
+          productId: order.productId,
+          buyerId: userId,
+          orderId: order.id,
+          status: 'active',
+          activatedAt: new Date(),
+          expiresAt: new Date(Date.now() + 365 * 24 * 60 * 60 * 1000), // 1년 유효
+        })
+        .returning({ key: licenseKeys.key });
+
+      await recordSale(tx, completedOrder);
+
+      return { licenseKey: license.key, alreadyProcessed: false };
     });
 
-    console.log(`[라이선스 키 생성] key: ${licenseKey}`);
+    if (result.licenseKey && !result.alreadyProcessed) {
+      invalidateLicenseKey(result.licenseKey);
+      console.log(`[라이선스 키 생성] key: ${result.licenseKey}`);
+    }
 
     return {
       success: true,
-      paymentId: paymentData.paymentKey,
+      paymentId: response.data?.paymentKey ?? paymentKey,
+      productName,
+      licenseKey: result.licenseKey,
+      alreadyProcessed: result.alreadyProcessed,
     };
   } catch (error) {
     console.error('[결제 승인 오류]', error);
@@ -160,20 +274,14 @@ export async function handlePaymentFailure(
     const db = await getDb();
     if (!db) throw new Error('Database not available');
 
-    // 주문 상태를 'failed'로 업데이트
-    const orderIdNum = parseInt(orderId.split('-')[0]) || 0;
-    const orderList = await db.select().from(orders).where(eq(orders.id, orderIdNum)).limit(1);
-    const order = orderList[0];
-
-    if (order) {
-      await db
-        .update(orders)
-        .set({
-          status: 'failed',
-          updatedAt: new Date(),
-        })
-        .where(eq(orders.id, order.id));
-    }
+    // 대기 중인 주문만 'failed'로 업데이트 (완료된 주문은 변경하지 않음)
+    await db
+      .update(orders)
+      .set({
+        status: 'failed',
+        updatedAt: new Date(),
+      })
+      .where(and(eq(orders.id, parseOrderId(orderId)), eq(orders.status, 'pending')));
 
     // 에러 로깅 (실제로는 모니터링 서비스에 전송)
     console.error(`[결제 실패 기록] ${errorCode}: ${errorMessage}`);
@@ -196,21 +304,15 @@ export async function cancelPayment(
     console.log(`[결제 취소] paymentKey: ${paymentKey}, reason: ${cancelReason}`);
 
     // Toss Payments API에 결제 취소 요청
-    const response = await fetch(`${TOSS_API_URL}/${paymentKey}/cancel`, {
-      method: 'POST',
-      headers: {
-        'Authorization': getBasicAuthHeader(),
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({
-        cancelReason: cancelReason,
-      }),
-    });
+    const response = await postToToss(
+      `/${paymentKey}/cancel`,
+      { cancelReason: cancelReason },
+      `${paymentKey}:cancel`
+    );
 
     if (!response.ok) {
-      const errorData = await response.json();
-      console.error('[결제 취소 실패]', errorData);
-      throw new Error(errorData.message || '결제 취소에 실패했습니다.');
+      console.error('[결제 취소 실패]', response.data);
+      throw new Error(response.data?.message || '결제 취소에 실패했습니다.');
     }
 
     console.log(`[결제 취소 성공] paymentKey: ${paymentKey}`);
@@ -226,3 +328,73 @@ export async function cancelPayment(
     };
   }
 }
+
+/**
+ * 주문 환불 처리
+ *
+ * Toss Payments 결제를 취소한 뒤 하나의 트랜잭션에서
+ * 주문 상태를 'refunded'로 변경하고, 라이선스 키를 회수하고, 판매 집계에 반영합니다.
+ */
+export async function refundOrder(
+  orderId: number,
+  sellerId: number,
+  cancelReason: string
+): Promise<{
+  success: boolean;
+  error?: string;
+}> {
+  try {
+    const db = await getDb();
+    if (!db) throw new Error('Database not available');
+
+    const orderList = await db.select().from(orders).where(eq(orders.id, orderId)).limit(1);
+    const order = orderList[0];
+
+    if (!order || order.sellerId !== sellerId) {
+      throw new Error('주문을 찾을 수 없습니다.');
+    }
+    if (order.status !== 'completed' || !order.transactionId) {
+      throw new Error('환불할 수 없는 주문입니다.');
+    }
+
+    const cancelResult = await cancelPayment(order.transactionId, cancelReason);
+    if (!cancelResult.success) {
+      throw new Error(cancelResult.error || '결제 취소에 실패했습니다.');
+    }
+
+    const revokedKeys = await db.transaction(async (tx) => {
+      const [refundedOrder] = await tx
+        .update(orders)
+        .set({
+          status: 'refunded',
+          updatedAt: new Date(),
+        })
+        .where(and(eq(orders.id, order.id), eq(orders.status, 'completed')))
+        .returning();
+
+      // 동시에 처리된 환불이 이미 반영한 경우
+      if (!refundedOrder) return [];
+
+      const revoked = await tx
+        .update(licenseKeys)
+        .set({ status: 'revoked', updatedAt: new Date() })
+        .where(eq(licenseKeys.orderId, order.id))
+        .returning({ key: licenseKeys.key });
+
+      await recordRefund(tx, refundedOrder);
+      return revoked;
+    });
+
+    revokedKeys.forEach(({ key }) => invalidateLicenseKey(key));
+
+    console.log(`[환불 완료] orderId: ${orderId}`);
+
+    return { success: true };
+  } catch (error) {
+    console.error('[환불 오류]', error);
+    return {
+      success: false,
+      error: error instanceof Error ? error.message : '알 수 없는 오류가 발생했습니다.',
+    };
+  }
+}
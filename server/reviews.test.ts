@@ -24,17 +24,14 @@ describe("Review API", () => {
   it("should create a review", async () => {
     const result = await createReview(testReview);
     expect(result).toBeDefined();
-    const insertId = (result as any).insertId;
-    if (insertId) {
-      createdReviewId = insertId as number;
-      expect(createdReviewId).toBeGreaterThan(0);
-    }
+    createdReviewId = result.id;
+    expect(createdReviewId).toBeGreaterThan(0);
   });
 
   it("should get reviews by product ID", async () => {
     const reviews = await getReviewsByProductId(1);
-    expect(Array.isArray(reviews)).toBe(true);
-    expect(reviews.length).toBeGreaterThanOrEqual(0);
+    expect(Array.isArray(reviews.items)).toBe(true);
+    expect(reviews.items.length).toBeGreaterThanOrEqual(0);
   });
 
   it("should get review by ID", async () => {
@@ -58,6 +55,8 @@ describe("Review API", () => {
   it("should get average rating for product", async () => {
     const avgRating = await getAverageRating(1);
     expect(avgRating).toBeDefined();
+    expect(avgRating.count).toBeGreaterThan(0);
+    expect(avgRating.histogram.reduce((sum, n) => sum + n, 0)).toBe(avgRating.count);
   });
 
   it("should delete a review", async () => {
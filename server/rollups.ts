@@ -0,0 +1,209 @@
+import { and, asc, eq, gte, lte, sql } from "drizzle-orm";
+import { orders, sellerDailySales, sellerProfiles, type Order } from "../drizzle/schema";
+import { getDb, type DbExecutor } from "./db";
+
+/**
+ * 판매 집계(rollup) 서비스
+ *
+ * seller_daily_sales 테이블에 판매자/제품/일자별 판매 건수와 매출을 누적합니다.
+ * - recordSale / recordRefund: 결제 승인, 환불과 같은 트랜잭션 안에서 호출
+ * - rebuildSalesRollups: orders 테이블로부터 전체 집계를 다시 계산 (백필, 드리프트 복구)
+ * - getSellerStats: 대시보드용 합계 및 일자별 시계열 (O(orders)가 아닌 O(days))
+ *
+ * 주문은 생성 시각(UTC)의 날짜로 집계되며, 환불은 원래 판매일의 refundCount/refundAmount로 기록됩니다.
+ * seller_profiles.totalEarnings / totalSales도 같은 트랜잭션에서 순매출 기준으로 갱신합니다.
+ */
+
+function toRollupDay(date: Date): string {
+  return date.toISOString().slice(0, 10);
+}
+
+/**
+ * 완료된 주문을 집계에 반영합니다.
+ */
+export async function recordSale(executor: DbExecutor, order: Order) {
+  const amount = order.totalPrice;
+
+  await executor
+    .insert(sellerDailySales)
+    .values({
+      sellerId: order.sellerId,
+      productId: order.productId,
+      day: toRollupDay(order.createdAt),
+      salesCount: 1,
+      revenue: amount,
+    })
+    .onConflictDoUpdate({
+      target: [sellerDailySales.sellerId, sellerDailySales.productId, sellerDailySales.day],
+      set: {
+        salesCount: sql`${sellerDailySales.salesCount} + 1`,
+        revenue: sql`${sellerDailySales.revenue} + ${amount}`,
+        updatedAt: new Date(),
+      },
+    });
+
+  await executor
+    .update(sellerProfiles)
+    .set({
+      totalEarnings: sql`${sellerProfiles.totalEarnings} + ${amount}`,
+      totalSales: sql`${sellerProfiles.totalSales} + 1`,
+      updatedAt: new Date(),
+    })
+    .where(eq(sellerProfiles.userId, order.sellerId));
+}
+
+/**
+ * 환불된 주문을 집계에 반영합니다.
+ */
+export async function recordRefund(executor: DbExecutor, order: Order) {
+  const amount = order.totalPrice;
+
+  await executor
+    .insert(sellerDailySales)
+    .values({
+      sellerId: order.sellerId,
+      productId: order.productId,
+      day: toRollupDay(order.createdAt),
+      refundCount: 1,
+      refundAmount: amount,
+    })
+    .onConflictDoUpdate({
+      target: [sellerDailySales.sellerId, sellerDailySales.productId, sellerDailySales.day],
+      set: {
+        refundCount: sql`${sellerDailySales.refundCount} + 1`,
+        refundAmount: sql`${sellerDailySales.refundAmount} + ${amount}`,
+        updatedAt: new Date(),
+      },
+    });
+
+  await executor
+    .update(sellerProfiles)
+    .set({
+      totalEarnings: sql`${sellerProfiles.totalEarnings} - ${amount}`,
+      totalSales: sql`${sellerProfiles.totalSales} - 1`,
+      updatedAt: new Date(),
+    })
+    .where(eq(sellerProfiles.userId, order.sellerId));
+}
+
+/**
+ * orders 테이블에서 집계 테이블과 판매자 프로필 합계를 다시 계산합니다.
+ */
+export async function rebuildSalesRollups() {
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+
+  return await db.transaction(async (tx) => {
+    await tx.delete(sellerDailySales);
+
+    const inserted = await tx.execute(sql`
+      INSERT INTO ${sellerDailySales} (
+        "sellerId", "productId", "day", "salesCount", "revenue", "refundCount", "refundAmount"
+      )
+      SELECT
+        ${orders.sellerId},
+        ${orders.productId},
+        ${orders.createdAt}::date,
+        COUNT(*),
+        SUM(${orders.totalPrice}),
+        COUNT(*) FILTER (WHERE ${orders.status} = 'refunded'),
+        COALESCE(SUM(${orders.totalPrice}) FILTER (WHERE ${orders.status} = 'refunded'), 0)
+      FROM ${orders}
+      WHERE ${orders.status} IN ('completed', 'refunded')
+      GROUP BY 1, 2, 3
+    `);
+
+    await tx
+      .update(sellerProfiles)
+      .set({
+        totalEarnings: sql`COALESCE((
+          SELECT SUM(${sellerDailySales.revenue} - ${sellerDailySales.refundAmount})
+          FROM ${sellerDailySales}
+          WHERE ${sellerDailySales.sellerId} = ${sellerProfiles.userId}
+        ), 0)`,
+        totalSales: sql`COALESCE((
+          SELECT SUM(${sellerDailySales.salesCount} - ${sellerDailySales.refundCount})
+          FROM ${sellerDailySales}
+          WHERE ${sellerDailySales.sellerId} = ${sellerProfiles.userId}
+        ), 0)`,
+        updatedAt: new Date(),
+      });
+
+    return { rows: inserted.count ?? 0 };
+  });
+}
+
+export type SellerStatsPoint = {
+  day: string;
+  sales: number;
+  revenue: number;
+  refunds: number;
+  refundAmount: number;
+};
+
+/**
+ * 판매자 합계(전체 기간)와 기간별 일자 시계열을 반환합니다.
+ */
+export async function getSellerStats(sellerId: number, from: Date, to: Date) {
+  const db = await getDb();
+  const empty = { sales: 0, revenue: 0, refunds: 0, refundAmount: 0 };
+  if (!db) return { totals: empty, range: empty, series: [] as SellerStatsPoint[] };
+
+  const [lifetime] = await db
+    .select({
+      sales: sql<number>`COALESCE(SUM(${sellerDailySales.salesCount}), 0)::int`,
+      revenue: sql<string>`COALESCE(SUM(${sellerDailySales.revenue}), 0)`,
+      refunds: sql<number>`COALESCE(SUM(${sellerDailySales.refundCount}), 0)::int`,
+      refundAmount: sql<string>`COALESCE(SUM(${sellerDailySales.refundAmount}), 0)`,
+    })
+    .from(sellerDailySales)
+    .where(eq(sellerDailySales.sellerId, sellerId));
+
+  const rows = await db
+    .select({
+      day: sellerDailySales.day,
+      sales: sql<number>`SUM(${sellerDailySales.salesCount})::int`,
+      revenue: sql<string>`SUM(${sellerDailySales.revenue})`,
+      refunds: sql<number>`SUM(${sellerDailySales.refundCount})::int`,
+      refundAmount: sql<string>`SUM(${sellerDailySales.refundAmount})`,
+    })
+    .from(sellerDailySales)
+    .where(
+      and(
+        eq(sellerDailySales.sellerId, sellerId),
+        gte(sellerDailySales.day, toRollupDay(from)),
+        lte(sellerDailySales.day, toRollupDay(to))
+      )
+    )
+    .groupBy(sellerDailySales.day)
+    .orderBy(asc(sellerDailySales.day));
+
+  const series: SellerStatsPoint[] = rows.map((row) => ({
+    day: row.day,
+    sales: row.sales,
+    revenue: parseFloat(row.revenue),
+    refunds: row.refunds,
+    refundAmount: parseFloat(row.refundAmount),
+  }));
+
+  const range = series.reduce(
+    (acc, point) => ({
+      sales: acc.sales + point.sales,
+      revenue: acc.revenue + point.revenue,
+      refunds: acc.refunds + point.refunds,
+      refundAmount: acc.refundAmount + point.refundAmount,
+    }),
+    empty
+  );
+
+  return {
+    totals: {
+      sales: lifetime.sales,
+      revenue: parseFloat(lifetime.revenue),
+      refunds: lifetime.refunds,
+      refundAmount: parseFloat(lifetime.refundAmount),
+    },
+    range,
+    series,
+  };
+}
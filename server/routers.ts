@@ -1,21 +1,21 @@
 import { getSessionCookieOptions } from "./_core/cookies";
 import { COOKIE_NAME } from "../shared/const";
 import { systemRouter } from "./_core/systemRouter";
-import { publicProcedure, protectedProcedure, router } from "./_core/trpc";
+import { resolveContextUser } from "./_core/context";
+import { adminProcedure, publicProcedure, protectedProcedure, router } from "./_core/trpc";
 import { z } from "zod";
 import {
-  getProducts,
   getProductById,
   getSellerProducts,
   createProduct,
   updateProduct,
-  generateLicenseKey,
-  getLicenseKeyByKey,
   getLicenseKeysByBuyerId,
+  getLicenseKeysBySellerId,
+  countLicenseKeysBySellerId,
   createOrder,
   getOrdersByBuyerId,
   getOrdersBySellerId,
-  recordDownload,
+  countActiveSellerProducts,
   getSellerProfile,
   createSellerProfile,
   createReview,
@@ -24,17 +24,43 @@ import {
   updateReview,
   deleteReview,
   getAverageRating,
+  reconcileProductRatings,
 } from "./db";
 import { getDb } from "./db";
-import { products, licenseKeys, orders } from "../drizzle/schema";
-import { eq, inArray, desc } from "drizzle-orm";
-import { nanoid } from "nanoid";
-import { approvePayment, handlePaymentFailure } from "./payment";
+import { products, licenseKeys } from "../drizzle/schema";
+import { eq } from "drizzle-orm";
+import { pageInput } from "./pagination";
+import {
+  getCatalogCacheStats,
+  getCatalogPage,
+  getCatalogProduct,
+  invalidateCatalogForCreate,
+  invalidateCatalogProduct,
+  invalidateCatalogRating,
+} from "./catalog";
+import { approvePayment, handlePaymentFailure, refundOrder } from "./payment";
+import { getSellerStats, rebuildSalesRollups } from "./rollups";
+import { MAX_SEARCH_QUERY_LENGTH, searchProducts } from "./search";
+import { getDownloadQueueStats, recordDownloadEvent } from "./downloads";
+import { getDownloadUrlCacheStats } from "./storage";
+import {
+  MAX_BATCH_VALIDATE_KEYS,
+  invalidateLicenseKey,
+  validateLicenseKey,
+  validateLicenseKeys,
+} from "./license";
+import {
+  MAX_BULK_GENERATE_COUNT,
+  MAX_SYNC_GENERATE_COUNT,
+  generateLicenseKeys,
+  getLicenseGenerationJob,
+  startLicenseGenerationJob,
+} from "./license-bulk";
 
 export const appRouter = router({
   system: systemRouter,
   auth: router({
-    me: publicProcedure.query(opts => opts.ctx.user),
+    me: publicProcedure.query(opts => resolveContextUser(opts.ctx)),
     logout: publicProcedure.mutation(({ ctx }) => {
       const cookieOptions = getSessionCookieOptions(ctx.req);
       ctx.res.clearCookie(COOKIE_NAME, { ...cookieOptions, maxAge: -1 });
@@ -48,24 +74,39 @@ export const appRouter = router({
   products: router({
     list: publicProcedure
       .input(
-        z.object({
-          limit: z.number().default(20),
-          offset: z.number().default(0),
+        pageInput.extend({
+          category: z.string().optional(),
         })
       )
       .query(async ({ input }) => {
-        return await getProducts(input.limit, input.offset);
+        return await getCatalogPage(input.category, input);
       }),
 
     getById: publicProcedure
       .input(z.object({ id: z.number() }))
       .query(async ({ input }) => {
-        return await getProductById(input.id);
+        return await getCatalogProduct(input.id);
       }),
 
-    getMySelling: protectedProcedure.query(async ({ ctx }) => {
-      return await getSellerProducts(ctx.user.id);
-    }),
+    // 전문/오타 허용 검색 (점수순, 첫 페이지에 facet 포함)
+    search: publicProcedure
+      .input(
+        pageInput.extend({
+          query: z.string().min(1).max(MAX_SEARCH_QUERY_LENGTH),
+          category: z.string().optional(),
+          minPrice: z.number().min(0).optional(),
+          maxPrice: z.number().min(0).optional(),
+        })
+      )
+      .query(async ({ input }) => {
+        return await searchProducts(input.query, input, input);
+      }),
+
+    getMySelling: protectedProcedure
+      .input(pageInput.optional())
+      .query(async ({ input, ctx }) => {
+        return await getSellerProducts(ctx.user.id, input);
+      }),
 
     create: protectedProcedure
       .input(
@@ -78,7 +119,7 @@ export const appRouter = router({
         })
       )
       .mutation(async ({ input, ctx }) => {
-        return await createProduct({
+        const result = await createProduct({
           sellerId: ctx.user.id,
           title: input.title,
           description: input.description,
@@ -86,6 +127,8 @@ export const appRouter = router({
           price: input.price,
           licenseType: input.licenseType,
         });
+        invalidateCatalogForCreate(result.id, result.category);
+        return result;
       }),
 
     update: protectedProcedure
@@ -104,13 +147,15 @@ export const appRouter = router({
         if (!product || product.sellerId !== ctx.user.id) {
           throw new Error("Unauthorized");
         }
-        return await updateProduct(input.id, {
+        const result = await updateProduct(input.id, {
           title: input.title,
           description: input.description,
           category: input.category,
           price: input.price,
           active: input.active,
         });
+        invalidateCatalogProduct(input.id, [product.category, input.category]);
+        return result;
       }),
 
     delete: protectedProcedure
@@ -122,34 +167,46 @@ export const appRouter = router({
         }
         const db = await getDb();
         if (!db) throw new Error("Database not available");
-        return await db.delete(products).where(eq(products.id, input.id));
+        const result = await db.delete(products).where(eq(products.id, input.id));
+        invalidateCatalogProduct(input.id, [product.category]);
+        return result;
       }),
+
+    // 카탈로그 캐시 통계
+    cacheStats: adminProcedure.query(() => getCatalogCacheStats()),
   }),
 
   // License endpoints
   licenses: router({
-    getMyLicenses: protectedProcedure.query(async ({ ctx }) => {
-      return await getLicenseKeysByBuyerId(ctx.user.id);
-    }),
+    getMyLicenses: protectedProcedure
+      .input(pageInput.optional())
+      .query(async ({ input, ctx }) => {
+        return await getLicenseKeysByBuyerId(ctx.user.id, input);
+      }),
 
     validateKey: publicProcedure
       .input(z.object({ key: z.string() }))
       .query(async ({ input }) => {
-        const license = await getLicenseKeyByKey(input.key);
-        if (!license) {
-          return { valid: false, message: "Invalid license key" };
-        }
-        if (license.status !== "active") {
-          return { valid: false, message: "License is not active" };
-        }
-        return { valid: true, message: "License is valid", license };
+        return await validateLicenseKey(input.key);
+      }),
+
+    // 라이선스 서버용 일괄 검증
+    // GET 쿼리는 입력이 URL에 들어가 500개 키가 헤더 한도(16KB)를 넘으므로 POST(mutation)로 받음
+    validateKeys: publicProcedure
+      .input(
+        z.object({
+          keys: z.array(z.string()).min(1).max(MAX_BATCH_VALIDATE_KEYS),
+        })
+      )
+      .mutation(async ({ input }) => {
+        return await validateLicenseKeys(input.keys);
       }),
 
     generateForProduct: protectedProcedure
       .input(
         z.object({
           productId: z.number(),
-          count: z.number().min(1).max(100),
+          count: z.number().min(1).max(MAX_SYNC_GENERATE_COUNT),
         })
       )
       .mutation(async ({ input, ctx }) => {
@@ -158,34 +215,48 @@ export const appRouter = router({
           throw new Error("Unauthorized");
         }
 
-        const keys = [];
-        for (let i = 0; i < input.count; i++) {
-          const key = await generateLicenseKey({
-            productId: input.productId,
-            key: `${input.productId}-${nanoid(20)}`,
-            status: "inactive",
-          });
-          keys.push(key);
-        }
-        return keys;
+        return await generateLicenseKeys(input.productId, input.count);
       }),
 
-    getSellerLicenses: protectedProcedure.query(async ({ ctx }) => {
-      const db = await getDb();
-      if (!db) throw new Error("Database not available");
+    // 대량 생성 (백그라운드 작업, getGenerationJob으로 진행률 폴링)
+    generateBulk: protectedProcedure
+      .input(
+        z.object({
+          productId: z.number(),
+          count: z.number().min(1).max(MAX_BULK_GENERATE_COUNT),
+        })
+      )
+      .mutation(async ({ input, ctx }) => {
+        const product = await getProductById(input.productId);
+        if (!product || product.sellerId !== ctx.user.id) {
+          throw new Error("Unauthorized");
+        }
 
-      const sellerProducts = await getSellerProducts(ctx.user.id);
-      const productIds = sellerProducts.map((p: any) => p.id);
+        return startLicenseGenerationJob(input.productId, ctx.user.id, input.count);
+      }),
 
-      if (productIds.length === 0) {
-        return [];
-      }
+    getGenerationJob: protectedProcedure
+      .input(z.object({ jobId: z.string() }))
+      .query(({ input, ctx }) => {
+        const job = getLicenseGenerationJob(input.jobId, ctx.user.id);
+        if (!job) throw new Error("Job not found");
+        return job;
+      }),
 
-      return await db
-        .select()
-        .from(licenseKeys)
-        .where(inArray(licenseKeys.productId, productIds))
-        .orderBy(desc(licenseKeys.createdAt));
+    getSellerLicenses: protectedProcedure
+      .input(
+        pageInput
+          .extend({
+            productId: z.number().optional(),
+          })
+          .optional()
+      )
+      .query(async ({ input, ctx }) => {
+        return await getLicenseKeysBySellerId(ctx.user.id, input);
+      }),
+
+    getSellerLicenseCounts: protectedProcedure.query(async ({ ctx }) => {
+      return await countLicenseKeysBySellerId(ctx.user.id);
     }),
 
     updateStatus: protectedProcedure
@@ -216,41 +287,49 @@ export const appRouter = router({
         const db = await getDb();
         if (!db) throw new Error("Database not available");
 
-        return await db
+        const result = await db
           .update(licenseKeys)
           .set({ status: input.status })
           .where(eq(licenseKeys.id, input.licenseId));
+        invalidateLicenseKey(license[0].key);
+        return result;
       }),
   }),
 
   // Order endpoints
   orders: router({
-    create: protectedProcedure
+    getMyOrders: protectedProcedure
+      .input(pageInput.optional())
+      .query(async ({ input, ctx }) => {
+        return await getOrdersByBuyerId(ctx.user.id, input);
+      }),
+
+    getSellingOrders: protectedProcedure
+      .input(pageInput.optional())
+      .query(async ({ input, ctx }) => {
+        return await getOrdersBySellerId(ctx.user.id, input);
+      }),
+  }),
+
+  // Seller sales statistics (served from seller_daily_sales rollups)
+  seller: router({
+    stats: protectedProcedure
       .input(
         z.object({
-          productId: z.number(),
-          licenseKeyId: z.number().optional(),
+          from: z.date(),
+          to: z.date(),
         })
       )
-      .mutation(async ({ input, ctx }) => {
-        const product = await getProductById(input.productId);
-        if (!product) throw new Error("Product not found");
-        return await createOrder({
-          productId: input.productId,
-          sellerId: product.sellerId,
-          buyerId: ctx.user.id,
-          unitPrice: product.price,
-          totalPrice: product.price,
-          status: "completed",
-        });
+      .query(async ({ input, ctx }) => {
+        const [stats, activeProducts] = await Promise.all([
+          getSellerStats(ctx.user.id, input.from, input.to),
+          countActiveSellerProducts(ctx.user.id),
+        ]);
+        return { ...stats, activeProducts };
       }),
 
-    getMyOrders: protectedProcedure.query(async ({ ctx }) => {
-      return await getOrdersByBuyerId(ctx.user.id);
-    }),
-
-    getSellingOrders: protectedProcedure.query(async ({ ctx }) => {
-      return await getOrdersBySellerId(ctx.user.id);
+    rebuildRollups: adminProcedure.mutation(async () => {
+      return await rebuildSalesRollups();
     }),
   }),
 
@@ -286,12 +365,20 @@ export const appRouter = router({
         })
       )
       .mutation(async ({ input, ctx }) => {
-        return await recordDownload({
+        return await recordDownloadEvent({
           userId: ctx.user.id,
           productId: input.productId,
           licenseKeyId: input.licenseKeyId,
+          ipAddress: ctx.req.ip ?? null,
+          userAgent: ctx.req.headers["user-agent"] ?? null,
         });
       }),
+
+    // 다운로드 이벤트 큐 / 서명 URL 캐시 통계
+    queueStats: adminProcedure.query(() => ({
+      queue: getDownloadQueueStats(),
+      downloadUrls: getDownloadUrlCacheStats(),
+    })),
   }),
 
   // Review endpoints
@@ -306,7 +393,7 @@ export const appRouter = router({
         })
       )
       .mutation(async ({ input, ctx }) => {
-        return await createReview({
+        const result = await createReview({
           productId: input.productId,
           buyerId: ctx.user.id,
           rating: input.rating,
@@ -314,12 +401,19 @@ export const appRouter = router({
           content: input.content,
           isVerifiedPurchase: true,
         });
+        invalidateCatalogRating(input.productId);
+        return result;
       }),
 
     getByProduct: publicProcedure
-      .input(z.object({ productId: z.number() }))
+      .input(
+        pageInput.extend({
+          productId: z.number(),
+          sort: z.enum(["newest", "helpful"]).optional(),
+        })
+      )
       .query(async ({ input }) => {
-        return await getReviewsByProductId(input.productId);
+        return await getReviewsByProductId(input.productId, input);
       }),
 
     getById: publicProcedure
@@ -342,11 +436,13 @@ export const appRouter = router({
         if (!review || review.buyerId !== ctx.user.id) {
           throw new Error("Unauthorized");
         }
-        return await updateReview(input.id, {
+        const result = await updateReview(input.id, {
           rating: input.rating,
           title: input.title,
           content: input.content,
         });
+        invalidateCatalogRating(review.productId);
+        return result;
       }),
 
     delete: protectedProcedure
@@ -356,7 +452,9 @@ export const appRouter = router({
         if (!review || review.buyerId !== ctx.user.id) {
           throw new Error("Unauthorized");
         }
-        return await deleteReview(input.id);
+        const result = await deleteReview(input.id);
+        invalidateCatalogRating(review.productId);
+        return result;
       }),
 
     getAverageRating: publicProcedure
@@ -364,6 +462,11 @@ export const appRouter = router({
       .query(async ({ input }) => {
         return await getAverageRating(input.productId);
       }),
+
+    // 평점 집계 재계산 (드리프트 복구)
+    reconcileRatings: adminProcedure.mutation(async () => {
+      return await reconcileProductRatings();
+    }),
   }),
 
   // Payment endpoints
@@ -379,7 +482,7 @@ export const appRouter = router({
         const product = await getProductById(input.productId);
         if (!product) throw new Error("Product not found");
 
-        // 주문 생성 (pending 상태)
+        // 주문 생성 (pending 상태, INSERT ... RETURNING)
         const order = await createOrder({
           productId: input.productId,
           sellerId: product.sellerId,
@@ -390,21 +493,8 @@ export const appRouter = router({
         });
 
         // 주문 ID 반환 (orderId 형식: {orderId}-{timestamp})
-        const db = await getDb();
-        if (!db) throw new Error("Database not available");
-
-        const createdOrder = await db
-          .select()
-          .from(orders)
-          .orderBy(desc(orders.id))
-          .limit(1);
-
-        if (!createdOrder.length) {
-          throw new Error("Failed to create order");
-        }
-
         return {
-          orderId: `${createdOrder[0].id}-${Date.now()}`,
+          orderId: `${order.id}-${Date.now()}`,
           amount: Math.round(parseFloat(product.price)),
           productName: product.title,
         };
@@ -431,33 +521,29 @@ export const appRouter = router({
           throw new Error(result.error || "결제 승인 실패");
         }
 
-        // 주문 정보 조회하여 제품명과 라이선스 키 반환
-        const orderIdNum = parseInt(input.orderId.split("-")[0]) || 0;
-        const db = await getDb();
-        if (!db) throw new Error("Database not available");
-
-        const order = await db
-          .select()
-          .from(orders)
-          .where(eq(orders.id, orderIdNum))
-          .limit(1);
-
-        const product = order[0] ? await getProductById(order[0].productId) : null;
-
-        // 생성된 라이선스 키 조회
-        const license = await db
-          .select()
-          .from(licenseKeys)
-          .where(eq(licenseKeys.orderId, orderIdNum))
-          .limit(1);
-
         return {
           success: true,
-          productName: product?.title || "제품",
-          licenseKey: license[0]?.key || null,
+          productName: result.productName || "제품",
+          licenseKey: result.licenseKey || null,
         };
       }),
 
+    // 환불 (판매자)
+    refund: protectedProcedure
+      .input(
+        z.object({
+          orderId: z.number(),
+          reason: z.string().min(1),
+        })
+      )
+      .mutation(async ({ input, ctx }) => {
+        const result = await refundOrder(input.orderId, ctx.user.id, input.reason);
+        if (!result.success) {
+          throw new Error(result.error || "환불 실패");
+        }
+        return { success: true };
+      }),
+
     // 결제 실패 처리
     fail: publicProcedure
       .input(
@@ -0,0 +1,20 @@
+import { describe, it, expect } from "vitest";
+import { toPrefixTsQuery } from "./search";
+
+describe("toPrefixTsQuery", () => {
+  it("should prefix-match every term", () => {
+    expect(toPrefixTsQuery("vs code")).toBe("vs:* & code:*");
+  });
+
+  it("should keep Korean terms intact", () => {
+    expect(toPrefixTsQuery("라이선스 관리")).toBe("라이선스:* & 관리:*");
+  });
+
+  it("should strip tsquery operators", () => {
+    expect(toPrefixTsQuery("foo & !bar | (baz):*")).toBe("foo:* & bar:* & baz:*");
+  });
+
+  it("should return null when no terms remain", () => {
+    expect(toPrefixTsQuery("  &| !  ")).toBeNull();
+  });
+});
@@ -0,0 +1,171 @@
+import { and, desc, eq, gte, lt, sql, type SQL } from "drizzle-orm";
+import { productRatings, products } from "../drizzle/schema";
+import {
+  getDb,
+  productColumns,
+  productRatingColumns,
+  toProductWithRating,
+  type ProductWithRating,
+} from "./db";
+import { afterKeyset, pageLimit, toKeysetPage, type Page, type PageParams } from "./pagination";
+
+/**
+ * 제품 검색
+ *
+ * - 전문 검색: products.searchVector (제목 A, 설명 B 가중치, 'simple' 설정) + GIN 인덱스
+ *   'simple'은 형태소 분석을 하지 않으므로 각 검색어를 접두사(:*)로 매칭해
+ *   "라이선스" 검색이 "라이선스를", "license" 검색이 "licenses"도 찾도록 합니다.
+ * - 오타 허용: pg_trgm word_similarity로 제목 매칭 (GIN gin_trgm_ops 인덱스)
+ *   한글 trigram은 데이터베이스 LC_CTYPE이 UTF-8 로케일이어야 동작하며, C 로케일에서는 전문 검색만 사용됩니다.
+ * - 정렬: ts_rank_cd + word_similarity 점수 내림차순, (score, id) keyset 커서
+ * - facet: 첫 페이지에서만 카테고리별/가격대별 개수를 계산
+ *   카테고리 facet은 가격 필터만, 가격 facet은 카테고리 필터만 적용 (선택 해제 시 개수 표시용)
+ */
+
+export const MAX_SEARCH_QUERY_LENGTH = 100;
+
+const MAX_CATEGORY_FACETS = 20;
+
+/** 가격대 facet 경계 [min, max) */
+export const PRICE_FACET_RANGES: Array<[number, number | null]> = [
+  [0, 10],
+  [10, 50],
+  [50, 100],
+  [100, 500],
+  [500, null],
+];
+
+export type ProductSearchFilters = {
+  category?: string;
+  minPrice?: number;
+  maxPrice?: number;
+};
+
+export type SearchFacets = {
+  categories: Array<{ category: string | null; count: number }>;
+  priceRanges: Array<{ min: number; max: number | null; count: number }>;
+};
+
+export type ProductSearchResult = Page<ProductWithRating & { score: number }> & {
+  /** 첫 페이지(cursor 없음)에서만 계산 */
+  facets: SearchFacets | null;
+};
+
+/**
+ * 사용자 입력을 접두사 매칭 tsquery 문자열로 변환합니다. (예: "vs code" → "vs:* & code:*")
+ * 문자/숫자 이외의 문자(tsquery 연산자 포함)는 구분자로 취급하며, 남는 검색어가 없으면 null을 반환합니다.
+ */
+export function toPrefixTsQuery(query: string): string | null {
+  const terms = query
+    .replace(/[^\p{L}\p{M}\p{N}]+/gu, " ")
+    .split(/\s+/)
+    .filter(Boolean);
+
+  if (terms.length === 0) return null;
+  return terms.map(term => `${term}:*`).join(" & ");
+}
+
+function priceFilter(filters: ProductSearchFilters): SQL | undefined {
+  return and(
+    filters.minPrice !== undefined ? gte(products.price, String(filters.minPrice)) : undefined,
+    filters.maxPrice !== undefined ? lt(products.price, String(filters.maxPrice)) : undefined
+  );
+}
+
+function categoryFilter(filters: ProductSearchFilters): SQL | undefined {
+  return filters.category ? eq(products.category, filters.category) : undefined;
+}
+
+/**
+ * 제품 검색 (활성 제품만)
+ */
+export async function searchProducts(
+  query: string,
+  filters: ProductSearchFilters = {},
+  page: PageParams = {}
+): Promise<ProductSearchResult> {
+  const empty: ProductSearchResult = { items: [], nextCursor: null, facets: null };
+
+  const text = query.trim();
+  const tsQueryText = toPrefixTsQuery(text);
+  if (!tsQueryText) return empty;
+
+  const db = await getDb();
+  if (!db) return empty;
+
+  const tsQuery = sql`to_tsquery('simple', ${tsQueryText})`;
+  const matches = sql`(${products.searchVector} @@ ${tsQuery} OR ${text} <% ${products.title})`;
+  // float8로 고정해 커서 값이 JS number로 정확히 왕복하도록 함
+  const score = sql<number>`round((ts_rank_cd(${products.searchVector}, ${tsQuery}) + word_similarity(${text}, ${products.title}))::numeric, 6)::float8`;
+  const baseFilter = and(eq(products.active, true), matches);
+
+  const limit = pageLimit(page);
+  const rowsPromise = db
+    .select({ product: productColumns, rating: productRatingColumns, score })
+    .from(products)
+    .leftJoin(productRatings, eq(productRatings.productId, products.id))
+    .where(
+      and(
+        baseFilter,
+        categoryFilter(filters),
+        priceFilter(filters),
+        afterKeyset(score, products.id, page.cursor)
+      )
+    )
+    .orderBy(desc(score), desc(products.id))
+    .limit(limit + 1);
+
+  const facetsPromise = page.cursor
+    ? Promise.resolve(null)
+    : getSearchFacets(baseFilter, filters);
+
+  const [rows, facets] = await Promise.all([rowsPromise, facetsPromise]);
+
+  const result = toKeysetPage(
+    rows.map(row => ({ ...toProductWithRating(row), score: row.score })),
+    limit,
+    row => row.score
+  );
+  return { ...result, facets };
+}
+
+async function getSearchFacets(
+  baseFilter: SQL | undefined,
+  filters: ProductSearchFilters
+): Promise<SearchFacets> {
+  const db = await getDb();
+  if (!db) return { categories: [], priceRanges: [] };
+
+  const count = sql<number>`COUNT(*)::int`;
+  // width_bucket: 첫 경계 미만은 0, 마지막 경계 이상은 경계 개수
+  const bounds = PRICE_FACET_RANGES.slice(1).map(([min]) => min);
+  const bucket = sql<number>`width_bucket(${products.price}, ${sql.raw(
+    `ARRAY[${bounds.join(", ")}]::numeric[]`
+  )})`;
+
+  const [categoryRows, bucketRows] = await Promise.all([
+    db
+      .select({ category: products.category, count })
+      .from(products)
+      .where(and(baseFilter, priceFilter(filters)))
+      .groupBy(products.category)
+      .orderBy(desc(count))
+      .limit(MAX_CATEGORY_FACETS),
+    db
+      .select({ bucket, count })
+      .from(products)
+      .where(and(baseFilter, categoryFilter(filters)))
+      .groupBy(bucket),
+  ]);
+
+  const bucketCounts = new Map(bucketRows.map(row => [row.bucket, row.count]));
+
+  return {
+    categories: categoryRows,
+    priceRanges: PRICE_FACET_RANGES.map(([min, max], i) => ({
+      min,
+      max,
+      count: bucketCounts.get(i) ?? 0,
+    })),
+  };
+}
@@ -2,6 +2,19 @@
 // Uses the Biz-provided storage proxy (Authorization: Bearer <token>)
 
 import { ENV } from './_core/env';
+import { TtlCache } from './_core/cache';
+
+// Signed download URLs are reused until shortly before they expire.
+// URLs without a recognizable expiry are kept for DOWNLOAD_URL_DEFAULT_TTL_MS.
+const DOWNLOAD_URL_DEFAULT_TTL_MS = 5 * 60 * 1000;
+const DOWNLOAD_URL_EXPIRY_MARGIN_MS = 60 * 1000;
+
+const downloadUrlCache = new TtlCache<string, string>({
+  maxSize: 10_000,
+  ttlMs: DOWNLOAD_URL_DEFAULT_TTL_MS,
+});
+// Concurrent misses for the same key share one proxy request.
+const pendingDownloadUrls = new Map<string, Promise<string>>();
 
 type StorageConfig = { baseUrl: string; apiKey: string };
 
@@ -38,9 +51,58 @@ async function buildDownloadUrl(
     method: "GET",
     headers: buildAuthHeaders(apiKey),
   });
+
+  if (!response.ok) {
+    const message = await response.text().catch(() => response.statusText);
+    throw new Error(
+      `Storage download URL failed (${response.status} ${response.statusText}): ${message}`
+    );
+  }
   return (await response.json()).url;
 }
 
+/**
+ * Reads the expiry of a presigned URL (S3/GCS V4 `X-*-Date` + `X-*-Expires`,
+ * or an epoch-seconds `Expires` parameter), in epoch milliseconds.
+ */
+export function getSignedUrlExpiry(url: string): number | null {
+  let params: URLSearchParams;
+  try {
+    params = new URL(url).searchParams;
+  } catch {
+    return null;
+  }
+
+  for (const prefix of ["X-Amz-", "X-Goog-"]) {
+    const signedAt = params.get(`${prefix}Date`)?.match(
+      /^(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})Z$/
+    );
+    const expiresIn = Number(params.get(`${prefix}Expires`));
+    if (signedAt && expiresIn > 0) {
+      const [, year, month, day, hour, minute, second] = signedAt.map(Number);
+      return Date.UTC(year, month - 1, day, hour, minute, second) + expiresIn * 1000;
+    }
+  }
+
+  const expires = params.get("Expires");
+  if (expires && /^\d+$/.test(expires)) {
+    return Number(expires) * 1000;
+  }
+  return null;
+}
+
+function cacheDownloadUrl(key: string, url: string) {
+  const expiresAt = getSignedUrlExpiry(url);
+  const ttlMs =
+    expiresAt === null
+      ? DOWNLOAD_URL_DEFAULT_TTL_MS
+      : expiresAt - DOWNLOAD_URL_EXPIRY_MARGIN_MS - Date.now();
+
+  if (ttlMs > 0) {
+    downloadUrlCache.set(key, url, ttlMs);
+  }
+}
+
 function ensureTrailingSlash(value: string): string {
   return value.endsWith("/") ? value : `${value}/`;
 }
@@ -89,14 +151,38 @@ export async function storagePut(
     );
   }
   const url = (await response.json()).url;
+  downloadUrlCache.delete(key);
   return { key, url };
 }
 
 export async function storageGet(relKey: string): Promise<{ key: string; url: string; }> {
   const { baseUrl, apiKey } = getStorageConfig();
   const key = normalizeKey(relKey);
+
+  const cached = downloadUrlCache.get(key);
+  if (cached) {
+    return { key, url: cached };
+  }
+
+  let pending = pendingDownloadUrls.get(key);
+  if (!pending) {
+    pending = buildDownloadUrl(baseUrl, key, apiKey)
+      .then(url => {
+        cacheDownloadUrl(key, url);
+        return url;
+      })
+      .finally(() => {
+        pendingDownloadUrls.delete(key);
+      });
+    pendingDownloadUrls.set(key, pending);
+  }
+
+  return { key, url: await pending };
+}
+
+export function getDownloadUrlCacheStats() {
   return {
-    key,
-    url: await buildDownloadUrl(baseUrl, key, apiKey),
+    ...downloadUrlCache.stats(),
+    pending: pendingDownloadUrls.size,
   };
 }